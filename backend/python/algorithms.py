@@ -0,0 +1,319 @@
+import numpy as np,os
+import math,random
+from utils import find_optimal_tile_placement
+from wire import InvalidState
+
+# Define algorithm-specific parameters configuration
+ALGORITHM_CONFIGS = {
+    "optimal": {
+        "display_name": "Optimal Search",
+        "description": "Exhaustive search for best solution",
+        "params": {
+            "max_iterations": {
+                "type": "number",
+                "default": 10000,
+                "min": 1000,
+                "max": 150000,
+                "step": 1000,
+                "label": "Max Iterations",
+                "description": "Maximum search iterations"
+            },
+            "random_seed": {
+                "type": "number", 
+                "default": 42,
+                "min": 1,
+                "max": 9999,
+                "step": 1,
+                "label": "Random Seed",
+                "description": "Seed for reproducible results"
+            },
+            "workers": {
+                "type": "number",
+                "default": 1,
+                "min": 1,
+                "max": 16,
+                "step": 1,
+                "label": "Worker Processes",
+                "description": "Split the search across this many CPU cores"
+            },
+            "search_mode": {
+                "type": "select",
+                "default": "sampling",
+                "options": [
+                    {"value": "sampling", "label": "Random Sampling"},
+                    {"value": "exact", "label": "Exact (Branch and Bound)"}
+                ],
+                "label": "Search Mode",
+                "description": "Exact mode proves optimality on small boards; iterations cap search nodes"
+            }
+        }
+    },
+    "greedy": {
+        "display_name": "Greedy Search",
+        "description": "Fast heuristic-based search",
+        "params": {
+            "max_iterations": {
+                "type": "number",
+                "default": 5000,
+                "min": 500,
+                "max": 50000,
+                "step": 500,
+                "label": "Max Iterations"
+            },
+            "random_seed": {
+                "type": "number",
+                "default": 42,
+                "min": 1,
+                "max": 9999,
+                "step": 1,
+                "label": "Random Seed"
+            },
+            "greediness": {
+                "type": "range",
+                "default": 0.8,
+                "min": 0.1,
+                "max": 1.0,
+                "step": 0.1,
+                "label": "Greediness Factor",
+                "description": "Higher values = more greedy"
+            }
+        }
+    },
+    "genetic": {
+        "display_name": "Genetic Algorithm",
+        "description": "Evolution-based optimization",
+        "params": {
+            "population_size": {
+                "type": "number",
+                "default": 100,
+                "min": 20,
+                "max": 500,
+                "step": 20,
+                "label": "Population Size"
+            },
+            "generations": {
+                "type": "number",
+                "default": 200,
+                "min": 50,
+                "max": 1000,
+                "step": 50,
+                "label": "Generations"
+            },
+            "mutation_rate": {
+                "type": "range",
+                "default": 0.1,
+                "min": 0.01,
+                "max": 0.5,
+                "step": 0.01,
+                "label": "Mutation Rate"
+            },
+            "crossover_rate": {
+                "type": "range",
+                "default": 0.8,
+                "min": 0.5,
+                "max": 1.0,
+                "step": 0.1,
+                "label": "Crossover Rate"
+            },
+            "random_seed": {
+                "type": "number",
+                "default": 42,
+                "min": 1,
+                "max": 9999,
+                "step": 1,
+                "label": "Random Seed"
+            }
+        }
+    },
+    "simulated": {
+        "display_name": "Simulated Annealing",
+        "description": "Temperature-based optimization",
+        "params": {
+            "initial_temp": {
+                "type": "number",
+                "default": 1000,
+                "min": 100,
+                "max": 5000,
+                "step": 100,
+                "label": "Initial Temperature"
+            },
+            "cooling_rate": {
+                "type": "range",
+                "default": 0.95,
+                "min": 0.8,
+                "max": 0.99,
+                "step": 0.01,
+                "label": "Cooling Rate"
+            },
+            "min_temp": {
+                "type": "range",
+                "default": 0.01,
+                "min": 0.001,
+                "max": 0.1,
+                "step": 0.001,
+                "label": "Minimum Temperature"
+            },
+            "max_iterations": {
+                "type": "number",
+                "default": 10000,
+                "min": 1000,
+                "max": 50000,
+                "step": 1000,
+                "label": "Max Iterations"
+            },
+            "time_limit": {
+                "type": "number",
+                "default": 30,
+                "min": 1,
+                "max": 300,
+                "step": 1,
+                "label": "Time Limit (s)",
+                "description": "Stop annealing after this many seconds"
+            },
+            "random_seed": {
+                "type": "number",
+                "default": 42,
+                "min": 1,
+                "max": 9999,
+                "step": 1,
+                "label": "Random Seed"
+            }
+        }
+    }
+}
+
+def resolve_params(solver_settings):
+    """
+    Pick the algorithm and fill its parameters from the request, falling back to defaults.
+
+    Each given value is coerced to its parameter's type and checked against the min/max
+    or options in ALGORITHM_CONFIGS; a bad value raises InvalidState.
+    """
+    solver_settings = solver_settings or {}
+    if not isinstance(solver_settings, dict):
+        raise InvalidState("solver_settings must be an object")
+    algorithm = solver_settings.get('algorithm', 'optimal')
+    algo_config = ALGORITHM_CONFIGS.get(algorithm, ALGORITHM_CONFIGS['optimal'])
+    params = {}
+    for param_name, param_config in algo_config['params'].items():
+        # Use provided value or default
+        if param_name in solver_settings:
+            params[param_name] = _coerce_param(param_name, solver_settings[param_name], param_config)
+        else:
+            params[param_name] = param_config['default']
+    return algorithm, params
+
+def _coerce_param(name, value, config):
+    """value as the type its config declares: an option of a select, else a number in [min, max]."""
+    if config['type'] == 'select':
+        options = [option['value'] for option in config['options']]
+        if value not in options:
+            raise InvalidState(f"solver_settings.{name} must be one of {', '.join(map(str, options))}, got {value!r}")
+        return value
+    try:
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            raise ValueError
+        number = float(value)
+    except ValueError:
+        raise InvalidState(f"solver_settings.{name} must be a number, got {value!r}") from None
+    # Parameters with an integer default (iterations, sizes, seeds) only take whole numbers
+    integral = isinstance(config['default'], int)
+    if not math.isfinite(number) or (integral and not number.is_integer()) \
+            or not config['min'] <= number <= config['max']:
+        kind = "an integer" if integral else "a number"
+        raise InvalidState(f"solver_settings.{name} must be {kind} in [{config['min']}, {config['max']}], "
+                           f"got {value!r}")
+    return int(number) if integral else number
+
+def parse_seeds(payload):
+    """
+    Warm-start layouts from payload['seeds'] as (normal_positions, frozen_positions) pairs.
+
+    A seed is a solver result ({normal_positions, frozen_positions}), a leaderboard entry
+    ({solution: {layout: {towers}}}), a layout ({layout: {towers}} or {towers}) or a bare
+    tower list. Towers use the game's {coord: {x, y}, clap} form; static ones are skipped.
+    Anything else raises InvalidState.
+    """
+    seeds = payload.get('seeds') or []
+    if not isinstance(seeds, list):
+        raise InvalidState("seeds must be a list")
+    parsed = []
+    for i, seed in enumerate(seeds):
+        if isinstance(seed, dict) and ('normal_positions' in seed or 'frozen_positions' in seed):
+            parsed.append(tuple(_seed_positions(seed.get(key, []), f"seeds[{i}].{key}")
+                                for key in ('normal_positions', 'frozen_positions')))
+            continue
+        if isinstance(seed, dict):
+            seed = seed.get('solution', seed)
+            seed = seed.get('layout', seed) if isinstance(seed, dict) else seed
+            seed = seed.get('towers', []) if isinstance(seed, dict) else seed
+        if not isinstance(seed, list):
+            raise InvalidState(f"seeds[{i}] must be a solver result, a layout or a tower list")
+        towers = []
+        for t in seed:
+            coord = t.get('coord') if isinstance(t, dict) else None
+            if not isinstance(coord, dict) or type(coord.get('x')) is not int or type(coord.get('y')) is not int:
+                raise InvalidState(f"seeds[{i}] has a tower without an integer coord x and y")
+            if not t.get('static'):
+                towers.append(t)
+        parsed.append(([(t['coord']['y'], t['coord']['x']) for t in towers if not t.get('clap')],
+                       [(t['coord']['y'], t['coord']['x']) for t in towers if t.get('clap')]))
+    return parsed
+
+def _seed_positions(positions, name):
+    """A seed's [row, col] list as tuples, else InvalidState."""
+    if not isinstance(positions, list) or not all(
+            isinstance(p, (list, tuple)) and len(p) == 2 and all(type(v) is int for v in p) for p in positions):
+        raise InvalidState(f"{name} must be a list of [row, col] integer pairs")
+    return [tuple(p) for p in positions]
+
+def run_solver(state, nt, nf, algorithm, params, monitor=None, seeds=None):
+    """Run the chosen algorithm on an extracted board; returns the find_optimal_tile_placement dict."""
+    # Set random seed if available
+    if 'random_seed' in params:
+        random.seed(params['random_seed'])
+        np.random.seed(params['random_seed'])
+
+    # Choose algorithm and pass parameters
+    if algorithm == 'optimal' and params['search_mode'] == 'exact':
+        return find_optimal_tile_placement(
+            state, k_normal=nt, l_frozen=nf, monitor=monitor, seeds=seeds, algorithm='exact',
+            max_nodes=int(params['max_iterations'])
+        )
+    elif algorithm == 'optimal':
+        return find_optimal_tile_placement(
+            state, k_normal=nt, l_frozen=nf, monitor=monitor, seeds=seeds,
+            max_attempts=params['max_iterations'],
+            workers=min(int(params['workers']), os.cpu_count() or 1),
+            seed=params['random_seed']
+        )
+    elif algorithm == 'greedy':
+        # Pass greedy-specific parameters
+        return find_optimal_tile_placement(
+            state, k_normal=nt, l_frozen=nf, monitor=monitor, seeds=seeds, algorithm='greedy',
+            greediness=params['greediness'],
+            max_iterations=int(params['max_iterations'])
+        )
+    elif algorithm == 'genetic':
+        # Pass genetic algorithm parameters
+        return find_optimal_tile_placement(
+            state, k_normal=nt, l_frozen=nf, monitor=monitor, seeds=seeds, algorithm='genetic',
+            seed=params['random_seed'],
+            population_size=int(params['population_size']),
+            generations=int(params['generations']),
+            mutation_rate=params['mutation_rate'],
+            crossover_rate=params['crossover_rate']
+        )
+    elif algorithm == 'simulated':
+        # Pass simulated annealing parameters
+        return find_optimal_tile_placement(
+            state, k_normal=nt, l_frozen=nf, monitor=monitor, seeds=seeds, algorithm='simulated',
+            seed=params['random_seed'],
+            initial_temp=params['initial_temp'],
+            cooling_rate=params['cooling_rate'],
+            min_temp=params['min_temp'],
+            max_iterations=int(params['max_iterations']),
+            time_limit=params['time_limit']
+        )
+    return find_optimal_tile_placement(state, k_normal=nt, l_frozen=nf, max_attempts=10000, monitor=monitor,
+                                       seeds=seeds)
@@ -0,0 +1,97 @@
+import json, os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from algorithms import parse_seeds, resolve_params, run_solver
+from cache import SolutionCache
+from utils import extract_state
+from wire import validate_settings
+
+def _solve_one(args):
+    state, nt, nf, algorithm, params, seeds = args
+    result = run_solver(state, nt, nf, algorithm, params, seeds=seeds)
+    if result:
+        result.pop('best_grid', None)
+    return result
+
+def _done(value):
+    future = Future()
+    future.set_result(value)
+    return future
+
+def _run_inline(args):
+    """_solve_one in this process, as a finished Future so failures stay per entry like on the pool."""
+    future = Future()
+    try:
+        future.set_result(_solve_one(args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+def solve_batch(payloads, solver_settings=None, workers=None, cache=None):
+    """
+    Solve many game states, yielding one entry per payload in input order.
+
+    Args:
+        payloads: Iterable (may be lazy) of /solver-style game states or their JSON text,
+            e.g. raw NDJSON lines; a payload's own solver_settings override the shared ones
+        solver_settings: Settings used by payloads that carry none
+        workers: Worker processes to fan unique boards out to (default: all cores)
+        cache: Optional SolutionCache consulted before solving and filled afterwards
+
+    Identical (board, tile counts, algorithm, params, seeds) combinations are solved once;
+    later copies carry duplicate_of with the index of the first one. Each entry is
+    the /solver result plus index and cache_hit, or {"index", "error"} when the
+    payload is malformed or no placement was found.
+    """
+    workers = max(1, min(workers or os.cpu_count() or 1, os.cpu_count() or 1))
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    first_seen = {}
+    pending = deque()
+
+    def finish(index, key, future, extra):
+        if 'error' in extra:
+            return {"index": index, **extra}
+        try:
+            result = future.result()
+        except Exception as e:
+            return {"index": index, "error": str(e)}
+        if not result:
+            return {"index": index, "error": "No optimal placement found", **extra}
+        if cache is not None and not extra['cache_hit'] and 'duplicate_of' not in extra:
+            result = cache.put(key, result)
+        return dict(result, index=index, **extra)
+
+    try:
+        for index, payload in enumerate(payloads):
+            try:
+                if isinstance(payload, (str, bytes)):
+                    payload = json.loads(payload)
+                settings = validate_settings(payload) or solver_settings or {}
+                algorithm, params = resolve_params(settings)
+                state, nt, nf, froz = extract_state(payload)
+                seeds = parse_seeds(payload)
+            except Exception as e:
+                pending.append((index, None, _done(None), {"error": f"Invalid game state: {e}"}))
+            else:
+                # Seeds steer the search, so seeded payloads only match identically seeded ones
+                key = SolutionCache.key(state, nt, nf, algorithm, dict(params, seeds=seeds) if seeds else params)
+                extra = {"algorithm_used": algorithm, "cache_hit": False}
+                if key in first_seen:
+                    first_index, future = first_seen[key]
+                    extra["duplicate_of"] = first_index
+                elif cache is not None and (cached := cache.get(key)) is not None:
+                    future = _done(dict(cached))
+                    extra["cache_hit"] = True
+                else:
+                    args = (state, nt, nf, algorithm, params, seeds)
+                    future = pool.submit(_solve_one, args) if pool else _run_inline(args)
+                first_seen.setdefault(key, (index, future))
+                pending.append((index, key, future, extra))
+            # Emit everything at the head of the line that is already finished
+            while pending and pending[0][2].done():
+                yield finish(*pending.popleft())
+        while pending:
+            yield finish(*pending.popleft())
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
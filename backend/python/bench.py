@@ -0,0 +1,231 @@
+"""
+Solver benchmark: a reproducible synthetic board corpus and a timing runner.
+
+    python bench.py                       # full corpus, production solver settings
+    python bench.py --quick               # small corpus, reduced solver budgets
+    python bench.py --out results.json --update-best
+    python bench.py --startup             # cold import time of the solver and server modules
+    python bench.py --corpus games.mzc    # boards from a packed corpus (corpus.py) instead
+
+Every record holds the wall time, evaluations per second and, for solvers, the
+score as a fraction of the best score known for that board (bench_best.json).
+"""
+import argparse, contextlib, io, json, os, random, statistics, subprocess, sys
+from time import perf_counter
+import utils
+from utils import extract_state, min_distance, score, get_valid_2x2_positions, place_tiles_optimally
+from algorithms import resolve_params, run_solver
+
+BEST_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_best.json')
+
+# Edges the start/end areas sit on; "corner" is the three-cell corner area
+LAYOUTS = [("left", "right"), ("top", "bottom"), ("corner", "corner"), ("left", "top"), ("right", "left")]
+
+# (name, height, width, static tower density, placeable towers, claps, layout index, seed)
+CORPUS = [
+    ("s10-sparse", 10, 10, 0.05, 3, 1, 0, 101),
+    ("s10-dense", 10, 10, 0.20, 3, 0, 1, 102),
+    ("s12-corner", 12, 12, 0.10, 4, 2, 2, 103),
+    ("m16-sparse", 16, 14, 0.05, 5, 2, 0, 104),
+    ("m16-mixed", 16, 14, 0.12, 5, 1, 3, 105),
+    ("m18-dense", 18, 16, 0.20, 6, 2, 1, 106),
+    ("m18-corner", 18, 16, 0.10, 6, 3, 2, 107),
+    ("l24-sparse", 24, 20, 0.05, 8, 3, 4, 108),
+    ("l24-dense", 24, 20, 0.18, 8, 2, 0, 109),
+    ("l30-mixed", 30, 24, 0.12, 10, 4, 3, 110),
+]
+QUICK = ["s10-sparse", "s12-corner", "m18-dense"]
+
+# Solver runs: (label, solver_settings); --quick merges QUICK_SETTINGS into each
+SOLVERS = [
+    ("optimal", {"algorithm": "optimal"}),
+    ("optimal-exact", {"algorithm": "optimal", "search_mode": "exact"}),
+    ("greedy", {"algorithm": "greedy"}),
+    ("genetic", {"algorithm": "genetic"}),
+    ("simulated", {"algorithm": "simulated"}),
+]
+QUICK_SETTINGS = {"max_iterations": 1000, "population_size": 40, "generations": 50, "time_limit": 5}
+
+def _area(edge, height, width, rng):
+    if edge == "corner":
+        x, y = rng.choice([(-1, -1), (width, -1), (-1, height), (width, height)])
+        dx, dy = (1 if x == -1 else -1), (1 if y == -1 else -1)
+        return [{"x": x, "y": y}, {"x": x + dx, "y": y}, {"x": x, "y": y + dy}]
+    if edge in ("left", "right"):
+        x = -1 if edge == "left" else width
+        y = rng.randrange(height - 1)
+        return [{"x": x, "y": y}, {"x": x, "y": y + 1}]
+    y = -1 if edge == "top" else height
+    x = rng.randrange(width - 1)
+    return [{"x": x, "y": y}, {"x": x + 1, "y": y}]
+
+def generate_board(rng, height, width, density, towers, claps, start="left", end="right", clap_share=0.3):
+    """
+    Random game state in the extract_state input format.
+
+    density is the share of cells covered by static 2x2 towers (a clap_share of them
+    frozen); towers and claps are the placeable tile counts. Boards whose start and
+    end are not connected are redrawn.
+    """
+    while True:
+        board = {"height": height, "width": width, "staticTowers": [],
+                 "startArea": _area(start, height, width, rng), "endArea": _area(end, height, width, rng)}
+        raw = {"board": board, "towers": towers + claps, "claps": claps}
+        taken = set()
+        for _ in range(int(density * height * width / 4)):
+            x, y = rng.randrange(width - 1), rng.randrange(height - 1)
+            cells = {(x + i, y + j) for i in range(2) for j in range(2)}
+            if cells & taken:
+                continue
+            taken |= cells
+            board["staticTowers"].append({"coord": {"x": x, "y": y}, "clap": rng.random() < clap_share})
+        if score(extract_state(raw)[0]) != -1:
+            return raw
+
+def corpus(names=None):
+    """The fixed benchmark corpus as {name: raw game state}, optionally restricted to names."""
+    boards = {}
+    for name, height, width, density, towers, claps, layout, seed in CORPUS:
+        if names is None or name in names:
+            start, end = LAYOUTS[layout]
+            boards[name] = generate_board(random.Random(seed), height, width, density, towers, claps, start, end)
+    return boards
+
+def _time(fn, min_time=0.2):
+    """Call fn repeatedly for at least min_time seconds; returns (seconds per call, calls)."""
+    calls, t0 = 0, perf_counter()
+    while True:
+        fn()
+        calls += 1
+        elapsed = perf_counter() - t0
+        if elapsed >= min_time:
+            return elapsed / calls, calls
+
+@contextlib.contextmanager
+def _count_evaluations():
+    """Collect every LayoutScorer created inside the block; yields a callable summing their evaluations."""
+    scorers, init = [], utils.LayoutScorer.__init__
+
+    def tracked(self, *args, **kwargs):
+        init(self, *args, **kwargs)
+        scorers.append(self)
+    utils.LayoutScorer.__init__ = tracked
+    try:
+        yield lambda: sum(s.evaluations for s in scorers)
+    finally:
+        utils.LayoutScorer.__init__ = init
+
+def bench_board(name, raw, solvers, quick=False, best=None):
+    """
+    Benchmark records for one board: the core functions first, then every solver run.
+    raw is a game state payload or a (board, k_normal, l_frozen) corpus record.
+    """
+    state, nt, nf = extract_state(raw)[:3] if isinstance(raw, dict) else raw
+    records = []
+    for label, fn in [("min_distance", lambda: min_distance(state)), ("score", lambda: score(state)),
+                      ("get_valid_2x2_positions", lambda: get_valid_2x2_positions(state))]:
+        seconds, calls = _time(fn)
+        records.append({"board": name, "target": label, "seconds": seconds, "evals_per_sec": 1 / seconds})
+    runs = [("place_tiles_optimally", None)] + solvers
+    for label, settings in runs:
+        with _count_evaluations() as evaluations, contextlib.redirect_stdout(io.StringIO()), \
+                contextlib.redirect_stderr(io.StringIO()):
+            t0 = perf_counter()
+            if settings is None:
+                attempts = QUICK_SETTINGS["max_iterations"] if quick else 2000
+                result = place_tiles_optimally(state, nt, nf, max_attempts=attempts, rng=random.Random(42))
+                best_score = result[1]
+            else:
+                algorithm, params = resolve_params(dict(settings, **(QUICK_SETTINGS if quick else {})))
+                result = run_solver(state, nt, nf, algorithm, params)
+                best_score = result['best_score'] if result else None
+            seconds = perf_counter() - t0
+        count = evaluations()
+        known = (best or {}).get(name)
+        records.append({"board": name, "target": label, "seconds": seconds, "evaluations": count,
+                        "evals_per_sec": count / seconds if seconds else None, "best_score": best_score,
+                        "quality": best_score / known if known and best_score is not None else None})
+    return records
+
+def startup_times(modules=("utils", "server"), runs=5):
+    """Median wall time of `import module` in a fresh interpreter, per module."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    code = "import time; t = time.perf_counter(); import {}; print(time.perf_counter() - t)"
+    times = {}
+    for module in modules:
+        samples = [float(subprocess.run([sys.executable, "-c", code.format(module)], cwd=here, check=True,
+                                        capture_output=True, text=True).stdout.split()[-1])
+                   for _ in range(runs)]
+        times[module] = statistics.median(samples)
+    return times
+
+def load_best(path=BEST_PATH):
+    if os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return {}
+
+def update_best(records, path=BEST_PATH):
+    """Raise the stored best known score of every board a run beat; returns the new table."""
+    best = load_best(path)
+    for record in records:
+        if record.get("best_score") is not None and record["best_score"] > best.get(record["board"], float('-inf')):
+            best[record["board"]] = record["best_score"]
+    with open(path, "w") as f:
+        json.dump(best, f, indent=4, sort_keys=True)
+    return best
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the maze solver on a fixed synthetic corpus")
+    parser.add_argument("--quick", action="store_true", help="small corpus and reduced solver budgets")
+    parser.add_argument("--boards", help="comma-separated board names (default: whole corpus)")
+    parser.add_argument("--solvers", help="comma-separated solver labels: " + ",".join(l for l, _ in SOLVERS))
+    parser.add_argument("--out", help="write the records to this JSON file")
+    parser.add_argument("--update-best", action="store_true", help="store new best known scores")
+    parser.add_argument("--write-corpus", metavar="DIR", help="dump the corpus boards as JSON files and exit")
+    parser.add_argument("--startup", action="store_true", help="time cold module imports and exit")
+    parser.add_argument("--corpus", metavar="FILE", help="benchmark the boards of a packed corpus file")
+    args = parser.parse_args(argv)
+
+    if args.startup:
+        for module, seconds in startup_times().items():
+            print(f"import {module:<10} {seconds:.3f}s")
+        return
+
+    names = args.boards.split(",") if args.boards else (QUICK if args.quick else None)
+    if args.corpus:
+        from corpus import Corpus
+        packed = Corpus(args.corpus)
+        wanted_boards = args.boards.split(",") if args.boards else None
+        boards = {name: (board, nt, nf) for name, board, nt, nf in packed
+                  if wanted_boards is None or name in wanted_boards}
+    else:
+        boards = corpus(names)
+    if args.write_corpus:
+        os.makedirs(args.write_corpus, exist_ok=True)
+        for name, raw in boards.items():
+            with open(os.path.join(args.write_corpus, f"{name}.json"), "w") as f:
+                json.dump(raw, f, indent=4)
+        print(f"Wrote {len(boards)} boards to {args.write_corpus}")
+        return
+    wanted = args.solvers.split(",") if args.solvers else None
+    solvers = [(label, settings) for label, settings in SOLVERS if wanted is None or label in wanted]
+
+    best = load_best()
+    records = []
+    print(f"{'board':<12} {'target':<24} {'seconds':>10} {'evals/s':>10} {'score':>8} {'quality':>8}")
+    for name, raw in boards.items():
+        for record in bench_board(name, raw, solvers, args.quick, best):
+            records.append(record)
+            cell = lambda v, width, digits: f"{v:>{width}.{digits}f}" if v is not None else f"{'-':>{width}}"
+            print(f"{record['board']:<12} {record['target']:<24} {record['seconds']:>10.5f} "
+                  f"{cell(record['evals_per_sec'], 10, 0)} {cell(record.get('best_score'), 8, 2)} "
+                  f"{cell(record.get('quality'), 8, 3)}")
+    if args.update_best:
+        update_best(records)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(records, f, indent=4)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
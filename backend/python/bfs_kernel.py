@@ -0,0 +1,92 @@
+"""
+Compiled min_distance: the same FIFO breadth-first search as utils.min_distance as
+a Numba kernel over the flat int8 board.
+
+Numba is optional and imported by the first available() call, so it costs nothing
+at startup. utils falls back to its pure-Python search when available() is False
+(Numba missing or compiling failed), or to the bitboard BFS with SOLVER_ENGINE=bitboard;
+SOLVER_ENGINE=python skips the kernel altogether.
+This module imports nothing from utils, so utils can import it at load time.
+"""
+import threading
+import numpy as np
+import metrics
+from paths import optimize_diagonal_path
+
+_kernel = None
+_compiled = False
+_local = threading.local()
+
+def _bfs(cells, width, dist, parent, queue):
+    """
+    BFS from every -1 cell in row-major order, neighbours right, left, down, up;
+    returns the first -2 cell dequeued or -1. Start cells are collected in the same
+    pass that resets the distances, so no start list has to be kept in sync with the board.
+    """
+    size = cells.size
+    tail = 0
+    for k in range(size):
+        if cells[k] == -1:
+            dist[k] = 0
+            parent[k] = -1
+            queue[tail] = k
+            tail += 1
+        else:
+            dist[k] = -1
+    head = 0
+    while head < tail:
+        k = queue[head]
+        head += 1
+        if cells[k] == -2:
+            return k
+        col = k % width
+        for nk, ok in ((k + 1, col + 1 < width), (k - 1, col > 0), (k + width, k + width < size),
+                       (k - width, k >= width)):
+            if ok and dist[nk] == -1 and (cells[nk] < 1 or cells[nk] > 4):
+                dist[nk] = dist[k] + 1
+                parent[nk] = k
+                queue[tail] = nk
+                tail += 1
+    return -1
+
+def _compile():
+    """The jitted kernel, or None when Numba is missing or cannot compile it."""
+    try:
+        from numba import njit
+        kernel = njit(cache=True, nogil=True)(_bfs)
+        probe = np.array([-1, 0, -2], dtype=np.int8)
+        kernel(probe, 3, *_buffers(3))
+        return kernel
+    except Exception:
+        return None
+
+def _buffers(size):
+    """Per-thread distance, parent and queue arrays, reused across calls on same-sized boards."""
+    buffers = getattr(_local, 'buffers', None)
+    if buffers is None or len(buffers[0]) != size:
+        buffers = _local.buffers = tuple(np.empty(size, dtype=np.int32) for _ in range(3))
+    return buffers
+
+def available():
+    """Whether the kernel can run; the first call compiles it."""
+    global _kernel, _compiled
+    if not _compiled:
+        _kernel, _compiled = _compile(), True
+    return _kernel is not None
+
+def min_distance(grid):
+    """Drop-in for utils.min_distance once available(): same (dist, optimized_path), ties included."""
+    metrics.current().inc('bfs_calls')
+    cells = np.ascontiguousarray(grid, dtype=np.int8)
+    width = cells.shape[1]
+    dist, parent, queue = _buffers(cells.size)
+    end = _kernel(cells.ravel(), width, dist, parent, queue)
+    if end == -1:
+        return -1, []
+    path = []
+    k = end
+    while k != -1:
+        path.append(divmod(int(k), width))
+        k = parent[k]
+    path.reverse()
+    return int(dist[end]), optimize_diagonal_path(path)
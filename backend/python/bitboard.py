@@ -0,0 +1,150 @@
+"""
+Bitboard engine: boards as Python int bitsets with bit-parallel flood fill.
+
+Cell (r, c) is bit r * stride + c with stride = width + 1; the spare column is never
+set, so a one-bit shift cannot wrap from the end of one row into the next. A BFS
+step is four shifts, an OR and an AND over the whole board.
+"""
+import numpy as np
+import metrics
+from paths import optimize_diagonal_path
+
+class Bitboard:
+    """Bitset view of an int8 board: passable cells, empty cells, starts (-1) and ends (-2)."""
+
+    def __init__(self, grid):
+        grid = np.asarray(grid)
+        self.height, self.width = grid.shape
+        self.stride = self.width + 1
+        padded = np.ones((self.height, self.stride), dtype=np.int8)
+        padded[:, :self.width] = grid
+        masks = np.stack([(padded < 1) | (padded > 4), padded == 0, padded == -1, padded == -2])
+        packed = np.packbits(masks.reshape(4, -1), axis=1, bitorder='little')
+        self.passable, self.empty, self.starts, self.ends = (int.from_bytes(row.tobytes(), 'little')
+                                                             for row in packed)
+        # min_distance's direction order: right, left, down, up
+        self.steps = (1, -1, self.stride, -self.stride)
+
+    def bit(self, row, col):
+        return 1 << (row * self.stride + col)
+
+    def mask(self, cells):
+        """Bitset of the set cells of a boolean (height, width) array."""
+        padded = np.zeros((self.height, self.stride), dtype=bool)
+        padded[:, :self.width] = cells
+        return int.from_bytes(np.packbits(padded.reshape(-1), bitorder='little').tobytes(), 'little')
+
+    def cells(self, bits):
+        """(row, col) of every set bit, in row-major order."""
+        return [divmod(k, self.stride) for k in self._bits(bits)]
+
+    def expand(self, frontier, allowed):
+        """Cells of `allowed` that are the frontier or 4-adjacent to it."""
+        s = self.stride
+        return (frontier | frontier << 1 | frontier >> 1 | frontier << s | frontier >> s) & allowed
+
+    def block(self, positions):
+        """Copy of this bitboard with 2x2 tiles placed at the given top-left positions."""
+        tiles = 0
+        quad = 3 | 3 << self.stride
+        for row, col in positions:
+            tiles |= quad << (row * self.stride + col)
+        board = object.__new__(Bitboard)
+        board.__dict__.update(self.__dict__)
+        board.passable &= ~tiles
+        board.empty &= ~tiles
+        return board
+
+    def reachable(self):
+        """Bitset of cells connected to a start through passable cells."""
+        seen, frontier = self.starts, self.starts
+        while frontier:
+            grown = self.expand(frontier, self.passable) & ~seen
+            seen |= grown
+            frontier = grown
+        return seen
+
+    def levels(self):
+        """BFS layers from the starts, stopping at the first layer that contains an end cell."""
+        layers = [self.starts]
+        seen = frontier = self.starts
+        while frontier and not frontier & self.ends:
+            frontier = self.expand(frontier, self.passable) & ~seen
+            seen |= frontier
+            layers.append(frontier)
+        return layers
+
+    def distance(self):
+        """Shortest start-to-end step count, -1 when the end is unreachable."""
+        layers = self.levels()
+        return len(layers) - 1 if layers[-1] & self.ends else -1
+
+    def min_distance(self):
+        """
+        Same (dist, optimized_path) as utils.min_distance, ties included.
+
+        Only cells on some shortest start-to-end path (a backward sweep over the BFS
+        layers) get ranked in min_distance's queue order: a cell's parent is its
+        neighbour of lowest rank in the previous layer and cells rank by
+        (parent rank, direction), which only ever involves cells of that cone.
+        """
+        layers = self.levels()
+        if not layers[-1] & self.ends:
+            return -1, []
+        cone = [layers[-1] & self.ends]
+        for layer in reversed(layers[:-1]):
+            cone.append(self.expand(cone[-1], layer) & layer)
+        cone.reverse()
+        parent = {}
+        rank = {k: i for i, k in enumerate(self._bits(cone[0]))}
+        steps = list(enumerate(self.steps))
+        for layer in cone[1:]:
+            keyed = []
+            for k in self._bits(layer):
+                # Key rank * 4 + direction orders by (parent rank, direction)
+                key = min(rank[k - step] * 4 + d for d, step in steps if k - step in rank)
+                parent[k] = k - self.steps[key & 3]
+                keyed.append((key, k))
+            keyed.sort()
+            rank = {k: i for i, (_, k) in enumerate(keyed)}
+        k = min(rank, key=rank.get)
+        path = [k]
+        while k in parent:
+            k = parent[k]
+            path.append(k)
+        return len(layers) - 1, optimize_diagonal_path([divmod(k, self.stride) for k in reversed(path)])
+
+    def _bits(self, bits):
+        """Indices of the set bits, ascending."""
+        out = []
+        while bits:
+            low = bits & -bits
+            out.append(low.bit_length() - 1)
+            bits ^= low
+        return out
+
+    def anchors(self):
+        """Bitset of top-left corners whose 2x2 window is entirely empty."""
+        e, s = self.empty, self.stride
+        return e & e >> 1 & e >> s & e >> (s + 1)
+
+    def fits(self, row, col):
+        """2x2 fit test: the tile's four bits are all empty cells (same as can_place_2x2_tile)."""
+        if not (0 <= row < self.height - 1 and 0 <= col < self.width - 1):
+            return False
+        quad = (3 | 3 << self.stride) << (row * self.stride + col)
+        return self.empty & quad == quad
+
+def min_distance(grid):
+    """Bitboard drop-in for utils.min_distance."""
+    metrics.current().inc('bfs_calls')
+    return Bitboard(grid).min_distance()
+
+def can_place_2x2_tile(grid, top_row, left_col):
+    """Bitboard drop-in for utils.can_place_2x2_tile."""
+    return Bitboard(grid).fits(top_row, left_col)
+
+def get_valid_2x2_positions(grid):
+    """Bitboard drop-in for utils.get_valid_2x2_positions (same row-major order)."""
+    board = Bitboard(grid)
+    return board.cells(board.anchors())
@@ -0,0 +1,116 @@
+import hashlib, json, sqlite3, threading
+from contextlib import closing
+from collections import OrderedDict
+import numpy as np
+
+class SolutionCache:
+    """
+    LRU cache of solver results keyed by a canonical hash of the board and the solve settings.
+
+    Entries live in memory (at most max_entries, least recently used evicted first) and,
+    when `path` is given, in a SQLite file so they survive worker restarts and are
+    shared between gunicorn workers. Results stored with their board are also found by
+    latest_for(board), whatever tile counts and settings produced them, to warm-start solves.
+    """
+
+    def __init__(self, max_entries=256, path=None):
+        self.max_entries = max_entries
+        self.path = path
+        self.entries = OrderedDict()
+        self.boards = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if path:
+            with closing(self._connect()) as db, db:
+                db.execute("CREATE TABLE IF NOT EXISTS solutions (key TEXT PRIMARY KEY, result TEXT)")
+                db.execute("CREATE TABLE IF NOT EXISTS boards (board TEXT PRIMARY KEY, key TEXT)")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=5)
+
+    @staticmethod
+    def key(grid, k_normal, l_frozen, algorithm, params):
+        """Canonical key: int8 board bytes and shape plus tile counts, algorithm and sorted params."""
+        board = np.ascontiguousarray(grid, dtype=np.int8)
+        digest = hashlib.sha1(board.tobytes())
+        digest.update(json.dumps([board.shape, int(k_normal), int(l_frozen), algorithm, params],
+                                 sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def board_key(grid):
+        """Key of the board alone (int8 bytes and shape), shared by every solve of it."""
+        board = np.ascontiguousarray(grid, dtype=np.int8)
+        digest = hashlib.sha1(board.tobytes())
+        digest.update(str(board.shape).encode())
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Cached result for key, or None."""
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+        if self.path:
+            with closing(self._connect()) as db, db:
+                row = db.execute("SELECT result FROM solutions WHERE key = ?", (key,)).fetchone()
+            if row:
+                result = json.loads(row[0])
+                self._remember(key, result)
+                with self.lock:
+                    self.hits += 1
+                return result
+        with self.lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, result, board=None):
+        """Store a JSON-serializable result; returns the stored (JSON round-tripped) copy."""
+        encoded = json.dumps(result, default=_to_builtin)
+        result = json.loads(encoded)
+        self._remember(key, result)
+        if board is not None:
+            board = self.board_key(board)
+            with self.lock:
+                self.boards[board] = key
+                self.boards.move_to_end(board)
+                while len(self.boards) > self.max_entries:
+                    self.boards.popitem(last=False)
+        if self.path:
+            with closing(self._connect()) as db, db:
+                db.execute("INSERT OR REPLACE INTO solutions (key, result) VALUES (?, ?)", (key, encoded))
+                if board is not None:
+                    db.execute("INSERT OR REPLACE INTO boards (board, key) VALUES (?, ?)", (board, key))
+        return dict(result)
+
+    def latest_for(self, grid):
+        """Most recently stored result for this board under any settings, or None."""
+        board = self.board_key(grid)
+        with self.lock:
+            key = self.boards.get(board)
+        if key is None and self.path:
+            with closing(self._connect()) as db, db:
+                row = db.execute("SELECT key FROM boards WHERE board = ?", (board,)).fetchone()
+            key = row and row[0]
+        return self.get(key) if key else None
+
+    def _remember(self, key, result):
+        with self.lock:
+            self.entries[key] = result
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {"entries": len(self.entries), "hits": self.hits, "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0}
+
+def _to_builtin(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
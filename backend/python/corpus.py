@@ -0,0 +1,129 @@
+"""
+Packed board corpus: many game states in one memory-mapped file.
+
+    python corpus.py pack games.mzc game_*.json      # pack extract_state payloads
+    python corpus.py pack bench.mzc --bench          # pack bench.py's synthetic corpus
+    python corpus.py info games.mzc
+
+Layout: a HEADER, then `count` fixed-stride records (height, width, normal and
+frozen tile counts, and the int8 board padded to the largest board with static
+tower cells), then a JSON index with the record names and per-record metadata.
+Padding is impassable and holds no frost, so a padded board scores and solves like
+the board itself and whole record ranges can go straight to batch_score.
+"""
+import json, struct, sys
+import numpy as np
+from utils import extract_state, batch_score
+
+MAGIC = b"MZC1"
+# magic, record count, padded height, padded width, index offset, index length
+HEADER = struct.Struct("<4sIHHQQ")
+DATA_OFFSET = 64
+
+def record_dtype(height, width):
+    return np.dtype([('height', '<u2'), ('width', '<u2'), ('k_normal', '<u2'), ('l_frozen', '<u2'),
+                     ('board', 'i1', (height, width))])
+
+def write_corpus(path, states, names=None, metadata=None):
+    """
+    Pack states into a corpus file.
+
+    Args:
+        path: Output file
+        states: extract_state payloads or (board, k_normal, l_frozen) tuples
+        names: Optional unique record names (default: "0", "1", ...)
+        metadata: Optional JSON-serializable dict per record
+
+    Returns:
+        int: Number of records written
+    """
+    states = [extract_state(s)[:3] if isinstance(s, dict) else s for s in states]
+    names = [str(i) for i in range(len(states))] if names is None else [str(n) for n in names]
+    if len(set(names)) != len(names) or len(names) != len(states):
+        raise ValueError("names must be unique, one per state")
+    height = max((np.shape(b)[0] for b, _, _ in states), default=0)
+    width = max((np.shape(b)[1] for b, _, _ in states), default=0)
+    records = np.zeros(len(states), dtype=record_dtype(height, width))
+    records['board'] = 1
+    for record, (board, k_normal, l_frozen) in zip(records, states):
+        board = np.asarray(board, dtype=np.int8)
+        record['height'], record['width'] = board.shape
+        record['k_normal'], record['l_frozen'] = k_normal, l_frozen
+        record['board'][:board.shape[0], :board.shape[1]] = board
+    index = json.dumps({"names": names, "metadata": metadata or [{} for _ in names]}).encode()
+    index_offset = DATA_OFFSET + records.nbytes
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(states), height, width, index_offset, len(index)).ljust(DATA_OFFSET, b"\0"))
+        f.write(records.tobytes())
+        f.write(index)
+    return len(states)
+
+class Corpus:
+    """
+    Read-only view of a corpus file. Boards are views into the memory map, so
+    nothing is parsed or copied until a board is actually used.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.data = np.memmap(path, dtype=np.uint8, mode='r')
+        magic, count, height, width, index_offset, index_length = HEADER.unpack_from(self.data)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a board corpus")
+        self.records = np.ndarray((count,), dtype=record_dtype(height, width), buffer=self.data,
+                                  offset=DATA_OFFSET)
+        index = json.loads(self.data[index_offset:index_offset + index_length].tobytes())
+        self.names = index["names"]
+        self.metadata = index["metadata"]
+        self.positions = {name: i for i, name in enumerate(self.names)}
+
+    def __len__(self):
+        return len(self.records)
+
+    def _position(self, key):
+        return self.positions[key] if isinstance(key, str) else key
+
+    def __getitem__(self, key):
+        """(board, k_normal, l_frozen) of a record by position or name; the board is a read-only view."""
+        record = self.records[self._position(key)]
+        board = record['board'][:record['height'], :record['width']]
+        return board, int(record['k_normal']), int(record['l_frozen'])
+
+    def __iter__(self):
+        """(name, board, k_normal, l_frozen) of every record in file order."""
+        for i, name in enumerate(self.names):
+            yield (name,) + self[i]
+
+    def boards(self, start=0, stop=None):
+        """Padded (N, H, W) board stack of a record range, a view for batch_score and friends."""
+        return self.records['board'][start:stop]
+
+    def batch_scores(self, chunk=4096, **weights):
+        """Base score of every record, chunk boards per batch_score call."""
+        scores = []
+        for start in range(0, len(self), chunk):
+            scores += batch_score(self.boards(start, start + chunk), **weights)
+        return scores
+
+def main(argv):
+    if len(argv) >= 2 and argv[0] == "info":
+        corpus = Corpus(argv[1])
+        shape = corpus.records.dtype['board'].shape
+        print(f"{argv[1]}: {len(corpus)} boards, padded to {shape[0]}x{shape[1]}, "
+              f"{corpus.records.dtype.itemsize} bytes per record")
+    elif len(argv) >= 2 and argv[0] == "pack":
+        if argv[2:] == ["--bench"]:
+            from bench import corpus as bench_corpus
+            boards = bench_corpus()
+            names, states = list(boards), list(boards.values())
+        else:
+            names, states = argv[2:], []
+            for name in names:
+                with open(name) as f:
+                    states.append(json.load(f))
+        print(f"Packed {write_corpus(argv[1], states, names)} boards into {argv[1]}")
+    else:
+        print(__doc__)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,169 @@
+import multiprocessing as mp
+import atexit, os, signal, threading, traceback, uuid
+from collections import OrderedDict
+from datetime import datetime
+from utils import SearchMonitor
+
+class _JobMonitor(SearchMonitor):
+    """SearchMonitor that also stops once the parent writes this job's number to the worker's cancel slot."""
+
+    def __init__(self, cancel_slot, seq, deadline_ms=None, on_improve=None):
+        super().__init__(deadline_ms, on_improve)
+        self.cancel_slot = cancel_slot
+        self.seq = seq
+
+    def expired(self):
+        if self.cancel_slot.value == self.seq:
+            self.cancelled = True
+        return super().expired()
+
+def _worker_loop(index, solve, tasks, events, cancel_slot):
+    os.setpgid(0, 0)  # own process group, so shutdown also reaches pools a solve started
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        job_id, seq, payload = task
+        events.put(("running", job_id, index))
+        try:
+            # Inside the try: a payload the monitor rejects fails its job, not the worker
+            monitor = _JobMonitor(
+                cancel_slot, seq,
+                deadline_ms=payload.get('solver_settings', {}).get('deadline_ms'),
+                on_improve=lambda best, normal, frozen: events.put(("progress", job_id, {
+                    "best_score": best, "normal_positions": normal, "frozen_positions": frozen
+                }))
+            )
+            result = solve(payload, monitor)
+            events.put(("cancelled" if monitor.cancelled else "done", job_id, result))
+        except Exception as e:
+            traceback.print_exc()
+            events.put(("failed", job_id, str(e)))
+
+class JobQueue:
+    """
+    In-process job queue that runs solves on a bounded pool of worker processes.
+
+    solve(payload, monitor) is called in a worker for every submitted payload and must
+    return a JSON-serializable result; partial results arrive through the monitor's
+    progress callback. Workers are forked lazily on the first submit. Job records live
+    in this process only, so every request for a job must reach the same server process.
+
+    Workers are not daemonic, so a solve may start its own process pool
+    (parallel_tile_placement); shutdown(), also run at interpreter exit, stops them.
+    """
+
+    def __init__(self, solve, workers=2, max_pending=100, max_records=1000):
+        self.solve = solve
+        self.workers = workers
+        self.max_pending = max_pending
+        self.max_records = max_records
+        self.jobs = OrderedDict()
+        self.lock = threading.Lock()
+        self.processes = []
+        self.seq = 0
+
+    def _start(self):
+        ctx = mp.get_context('fork')
+        self.tasks = ctx.Queue()
+        self.events = ctx.Queue()
+        # Sequence numbers are per job, so a late cancel can never hit the worker's next job
+        self.cancel_slots = [ctx.Value('q', -1, lock=False) for _ in range(self.workers)]
+        for i in range(self.workers):
+            process = ctx.Process(target=_worker_loop,
+                                  args=(i, self.solve, self.tasks, self.events, self.cancel_slots[i]))
+            process.start()
+            self.processes.append(process)
+        threading.Thread(target=self._listen, daemon=True).start()
+        atexit.register(self.shutdown)
+
+    def shutdown(self, timeout=5):
+        """
+        Cancel running jobs and stop the workers; one still busy after timeout seconds is
+        terminated together with the processes it started.
+        """
+        with self.lock:
+            processes, self.processes = self.processes, []
+            for job in self.jobs.values():
+                if job['status'] in ('running', 'cancelling') and job['worker'] is not None:
+                    self.cancel_slots[job['worker']].value = job['seq']
+        for _ in processes:
+            self.tasks.put(None)
+        for process in processes:
+            process.join(timeout)
+            if process.is_alive():
+                os.killpg(process.pid, signal.SIGTERM)
+                process.join()
+
+    def _listen(self):
+        while True:
+            kind, job_id, value = self.events.get()
+            with self.lock:
+                job = self.jobs.get(job_id)
+                if job is None:
+                    continue
+                if kind == "running":
+                    job['worker'] = value
+                    if job['status'] == 'cancelled':
+                        # Cancelled while queued: stop it as soon as it starts
+                        self.cancel_slots[value].value = job['seq']
+                        continue
+                    job['status'] = 'running'
+                    job['started'] = _now()
+                elif kind == "progress":
+                    job['best'] = value
+                else:
+                    job['status'] = 'failed' if kind == 'failed' else (
+                        'cancelled' if job['status'] in ('cancelling', 'cancelled') or kind == 'cancelled' else 'done')
+                    job['finished'] = _now()
+                    job['worker'] = None
+                    if kind == 'failed':
+                        job['error'] = value
+                    else:
+                        job['result'] = value
+
+    def submit(self, payload):
+        """Queue a solve; returns the job id, or None when too many jobs are pending."""
+        with self.lock:
+            if not self.processes:
+                self._start()
+            pending = sum(job['status'] in ('queued', 'running', 'cancelling') for job in self.jobs.values())
+            if pending >= self.max_pending:
+                return None
+            job_id = uuid.uuid4().hex
+            self.seq += 1
+            seq = self.seq
+            self.jobs[job_id] = {"id": job_id, "seq": seq, "status": "queued", "created": _now(), "started": None,
+                                 "finished": None, "worker": None, "best": None, "result": None, "error": None}
+            self._trim()
+        self.tasks.put((job_id, seq, payload))
+        return job_id
+
+    def get(self, job_id):
+        """Snapshot of a job record, or None if unknown."""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return {k: v for k, v in job.items() if k not in ('worker', 'seq')} if job else None
+
+    def cancel(self, job_id):
+        """Cancel a queued or running job; returns its record, or None if unknown."""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            if job['status'] == 'queued':
+                job['status'] = 'cancelled'
+                job['finished'] = _now()
+            elif job['status'] == 'running':
+                job['status'] = 'cancelling'
+                self.cancel_slots[job['worker']].value = job['seq']
+        return self.get(job_id)
+
+    def _trim(self):
+        finished = [job_id for job_id, job in self.jobs.items()
+                    if job['status'] in ('done', 'failed', 'cancelled')]
+        for job_id in finished[:max(0, len(self.jobs) - self.max_records)]:
+            del self.jobs[job_id]
+
+def _now():
+    return datetime.now().isoformat()
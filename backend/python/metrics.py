@@ -0,0 +1,111 @@
+import threading
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from time import perf_counter
+
+class SolveMetrics:
+    """Counters and per-phase wall time collected during one solve."""
+
+    def __init__(self):
+        self.counters = Counter()
+        self.phases = defaultdict(float)
+
+    def inc(self, name, n=1):
+        self.counters[name] += n
+
+    @contextmanager
+    def phase(self, name):
+        t0 = perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] += perf_counter() - t0
+
+    def merge(self, other):
+        """Add another SolveMetrics (e.g. from a worker process) into this one."""
+        self.counters.update(other.counters)
+        for name, seconds in other.phases.items():
+            self.phases[name] += seconds
+
+    def as_dict(self):
+        out = {"counters": dict(self.counters),
+               "phases": {name: round(seconds, 6) for name, seconds in self.phases.items()}}
+        if self.counters["memo_lookups"]:
+            out["memo_hit_rate"] = round(self.counters["memo_hits"] / self.counters["memo_lookups"], 4)
+        return out
+
+class Registry:
+    """Process-wide totals of finished solves, rendered in the Prometheus text format."""
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+    HELP = {
+        "bfs_calls": "Full breadth-first searches over a board",
+        "bfs_repairs": "Partial BFS repairs of a cached distance field",
+        "path_cache_hits": "Candidate layouts that left the cached shortest path intact",
+        "score_calls": "Calls to score()",
+        "layout_evaluations": "Candidate layouts scored by the search engines",
+        "memo_lookups": "Layout score lookups in the per-solve memo",
+        "memo_hits": "Layout scores served from the per-solve memo",
+        "sampler_jams": "Sampling attempts lost because no compatible anchor was left",
+        "early_terminations": "Searches stopped early on an excellent score",
+        "result_cache_hits": "Solves answered from the solution cache",
+    }
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = Counter()
+        self.histograms = {}
+
+    def _observe(self, name, labels, value):
+        buckets, total = self.histograms.setdefault((name, labels), ([0] * (len(self.BUCKETS) + 1), [0.0, 0]))
+        buckets[bisect_left(self.BUCKETS, value)] += 1
+        total[0] += value
+        total[1] += 1
+
+    def record(self, metrics, algorithm, seconds):
+        """Fold one finished solve into the totals."""
+        with self.lock:
+            self.counters.update(metrics.counters)
+            self.counters["solves"] += 1
+            self._observe("solver_request_seconds", (("algorithm", algorithm),), seconds)
+            for phase, value in metrics.phases.items():
+                self._observe("solver_phase_seconds", (("phase", phase),), value)
+
+    def render(self):
+        lines = []
+        with self.lock:
+            names = sorted(set(self.HELP) | set(self.counters))
+            for name in names:
+                metric = f"solver_{name}_total"
+                lines += [f"# HELP {metric} {self.HELP.get(name, name.replace('_', ' ').capitalize())}",
+                          f"# TYPE {metric} counter", f"{metric} {self.counters[name]}"]
+            seen = set()
+            for (name, labels), (buckets, (total, count)) in sorted(self.histograms.items()):
+                if name not in seen:
+                    seen.add(name)
+                    lines += [f"# HELP {name} Wall time in seconds", f"# TYPE {name} histogram"]
+                label = ",".join(f'{k}="{v}"' for k, v in labels)
+                cumulative = 0
+                for bound, n in zip(self.BUCKETS + ("+Inf",), buckets):
+                    cumulative += n
+                    lines.append(f'{name}_bucket{{{label},le="{bound}"}} {cumulative}')
+                lines += [f"{name}_sum{{{label}}} {total}", f"{name}_count{{{label}}} {count}"]
+        return "\n".join(lines) + "\n"
+
+registry = Registry()
+_local = threading.local()
+_idle = SolveMetrics()
+
+def current():
+    """The SolveMetrics collecting on this thread; outside collect() counts are discarded."""
+    return getattr(_local, "metrics", None) or _idle
+
+@contextmanager
+def collect():
+    """Collect counters and phases of the code inside the block into a fresh SolveMetrics."""
+    previous = getattr(_local, "metrics", None)
+    _local.metrics = metrics = SolveMetrics()
+    try:
+        yield metrics
+    finally:
+        _local.metrics = previous
@@ -0,0 +1,35 @@
+"""
+Path helpers shared by every BFS engine (utils, bfs_kernel, bitboard).
+
+A leaf module: it imports nothing from this package, so the engines can use it
+without importing utils and utils can import the engines at load time.
+"""
+
+def optimize_diagonal_path(path):
+    """Optimize path by replacing two orthogonal moves with diagonal when possible."""
+    if len(path) < 3:
+        return path
+    
+    optimized = [path[0]]
+    i = 1
+    
+    while i < len(path) - 1:
+        curr = path[i-1]
+        next1 = path[i]
+        next2 = path[i+1]
+        
+        dr1, dc1 = next1[0] - curr[0], next1[1] - curr[1]
+        dr2, dc2 = next2[0] - next1[0], next2[1] - next1[1]
+        
+        if (abs(dr1) + abs(dc1) == 1 and abs(dr2) + abs(dc2) == 1 and 
+            dr1 != dr2 and dc1 != dc2):
+            optimized.append(next2)
+            i += 2
+        else:
+            optimized.append(next1)
+            i += 1
+    
+    if i == len(path) - 1:
+        optimized.append(path[-1])
+    
+    return optimized
@@ -1,236 +1,117 @@
-from flask import Flask, request, jsonify
-import numpy as np,os
-import random
+from flask import Flask, request, jsonify, Response, stream_with_context
+import os
+import json,queue,threading
 from datetime import datetime
 from time import time
 from utils import *
-from flask_ngrok import run_with_ngrok
+from cache import SolutionCache
+from algorithms import ALGORITHM_CONFIGS, resolve_params, run_solver, parse_seeds
+from jobs import JobQueue
+from batch import solve_batch
+from wire import RESPONSE_FORMATS, encode_result, require_int, validate_settings
+import metrics
 from flask_cors import CORS
 
 app = Flask(__name__)
-# run_with_ngrok(app)
+if os.environ.get('USE_NGROK'):  # public tunnel for local testing, imported only when asked for
+    from flask_ngrok import run_with_ngrok
+    run_with_ngrok(app)
 CORS(app)
 
-# Define algorithm-specific parameters configuration
-ALGORITHM_CONFIGS = {
-    "optimal": {
-        "display_name": "Optimal Search",
-        "description": "Exhaustive search for best solution",
-        "params": {
-            "max_iterations": {
-                "type": "number",
-                "default": 10000,
-                "min": 1000,
-                "max": 150000,
-                "step": 1000,
-                "label": "Max Iterations",
-                "description": "Maximum search iterations"
-            },
-            "random_seed": {
-                "type": "number", 
-                "default": 42,
-                "min": 1,
-                "max": 9999,
-                "step": 1,
-                "label": "Random Seed",
-                "description": "Seed for reproducible results"
-            }
-        }
-    },
-    "greedy": {
-        "display_name": "Greedy Search",
-        "description": "Fast heuristic-based search",
-        "params": {
-            "max_iterations": {
-                "type": "number",
-                "default": 5000,
-                "min": 500,
-                "max": 50000,
-                "step": 500,
-                "label": "Max Iterations"
-            },
-            "random_seed": {
-                "type": "number",
-                "default": 42,
-                "min": 1,
-                "max": 9999,
-                "step": 1,
-                "label": "Random Seed"
-            },
-            "greediness": {
-                "type": "range",
-                "default": 0.8,
-                "min": 0.1,
-                "max": 1.0,
-                "step": 0.1,
-                "label": "Greediness Factor",
-                "description": "Higher values = more greedy"
-            }
-        }
-    },
-    "genetic": {
-        "display_name": "Genetic Algorithm",
-        "description": "Evolution-based optimization",
-        "params": {
-            "population_size": {
-                "type": "number",
-                "default": 100,
-                "min": 20,
-                "max": 500,
-                "step": 20,
-                "label": "Population Size"
-            },
-            "generations": {
-                "type": "number",
-                "default": 200,
-                "min": 50,
-                "max": 1000,
-                "step": 50,
-                "label": "Generations"
-            },
-            "mutation_rate": {
-                "type": "range",
-                "default": 0.1,
-                "min": 0.01,
-                "max": 0.5,
-                "step": 0.01,
-                "label": "Mutation Rate"
-            },
-            "crossover_rate": {
-                "type": "range",
-                "default": 0.8,
-                "min": 0.5,
-                "max": 1.0,
-                "step": 0.1,
-                "label": "Crossover Rate"
-            },
-            "random_seed": {
-                "type": "number",
-                "default": 42,
-                "min": 1,
-                "max": 9999,
-                "step": 1,
-                "label": "Random Seed"
-            }
-        }
-    },
-    "simulated": {
-        "display_name": "Simulated Annealing",
-        "description": "Temperature-based optimization",
-        "params": {
-            "initial_temp": {
-                "type": "number",
-                "default": 1000,
-                "min": 100,
-                "max": 5000,
-                "step": 100,
-                "label": "Initial Temperature"
-            },
-            "cooling_rate": {
-                "type": "range",
-                "default": 0.95,
-                "min": 0.8,
-                "max": 0.99,
-                "step": 0.01,
-                "label": "Cooling Rate"
-            },
-            "min_temp": {
-                "type": "range",
-                "default": 0.01,
-                "min": 0.001,
-                "max": 0.1,
-                "step": 0.001,
-                "label": "Minimum Temperature"
-            },
-            "max_iterations": {
-                "type": "number",
-                "default": 10000,
-                "min": 1000,
-                "max": 50000,
-                "step": 1000,
-                "label": "Max Iterations"
-            },
-            "random_seed": {
-                "type": "number",
-                "default": 42,
-                "min": 1,
-                "max": 9999,
-                "step": 1,
-                "label": "Random Seed"
-            }
-        }
-    }
-}
+# Repeat boards are answered from here; set SOLVER_CACHE_PATH to persist across restarts
+solution_cache = SolutionCache(max_entries=int(os.environ.get('SOLVER_CACHE_SIZE', 256)),
+                               path=os.environ.get('SOLVER_CACHE_PATH'))
+
+def warm_start_seeds(data, state):
+    """
+    Seed layouts for a /solver payload: its own `seeds`, plus the last cached result for
+    the same board when solver_settings.warm_start is set.
+    """
+    seeds = parse_seeds(data)
+    if (data.get('solver_settings') or {}).get('warm_start'):
+        cached = solution_cache.latest_for(state)
+        if cached is not None:
+            seeds.append((cached['normal_positions'], cached['frozen_positions']))
+    return seeds
+
+def cached_solve(state, nt, nf, algorithm, params, use_cache=True, monitor=None, seeds=None):
+    """run_solver behind solution_cache; returns (result without best_grid, cache_hit)."""
+    if monitor is not None and monitor.deadline is not None:
+        # Deadline-bounded runs depend on timing, so they are neither served nor stored
+        result = run_solver(state, nt, nf, algorithm, params, monitor, seeds)
+        if result:
+            result.pop('best_grid', None)
+        return result, False
+    key = SolutionCache.key(state, nt, nf, algorithm, dict(params, seeds=seeds) if seeds else params)
+    if use_cache:
+        with metrics.current().phase('cache_lookup'):
+            cached = solution_cache.get(key)
+        if cached is not None:
+            metrics.current().inc('result_cache_hits')
+            return dict(cached), True
+    result = run_solver(state, nt, nf, algorithm, params, monitor, seeds)
+    if result:
+        result.pop('best_grid', None)
+        if monitor is None or not monitor.cancelled:
+            result = solution_cache.put(key, result, board=state)
+    return result, False
+
+def deadline_ms(solver_settings):
+    """solver_settings.deadline_ms: None (no deadline) or a positive integer."""
+    value = (solver_settings or {}).get('deadline_ms')
+    return None if value is None else require_int(value, 'solver_settings.deadline_ms', 1)
+
+def response_format(solver_settings, allowed=RESPONSE_FORMATS):
+    """solver_settings.response_format, checked against the formats the endpoint can send."""
+    fmt = (solver_settings or {}).get('response_format', 'json')
+    if fmt not in allowed:
+        raise InvalidState(f"response_format must be one of {', '.join(allowed)}")
+    return fmt
 
 @app.route("/solver", methods=["POST"])
 def solve_maze():
+    """
+    Solve one board. solver_settings.response_format selects the encoding: "json"
+    (default), "flat" (flat position lists, no parameters_used) or "binary"
+    (application/octet-stream, see wire.py; time and cache hit go in X- headers).
+    """
     data = request.get_json()
     print("Received solving request!")
     
     try:
         # Extract solver settings
-        solver_settings = data.get('solver_settings', {})
-        algorithm = solver_settings.get('algorithm', 'optimal')
-        
-        # Get algorithm config and extract parameters
-        algo_config = ALGORITHM_CONFIGS.get(algorithm, ALGORITHM_CONFIGS['optimal'])
-        params = {}
-        
-        for param_name, param_config in algo_config['params'].items():
-            # Use provided value or default
-            params[param_name] = solver_settings.get(param_name, param_config['default'])
-        
+        solver_settings = validate_settings(data)
+        fmt = response_format(solver_settings)
+        deadline = deadline_ms(solver_settings)
+        algorithm, params = resolve_params(solver_settings)
         print(f"Solver settings: Algorithm={algorithm}, Params={params}")
         
-        # Set random seed if available
-        if 'random_seed' in params:
-            random.seed(params['random_seed'])
-            np.random.seed(params['random_seed'])
-        
         state, nt, nf, froz = extract_state(data)
+        seeds = warm_start_seeds(data, state)
         print('Game state extracted successfully!')
         
         t0 = time()
-        
-        # Choose algorithm and pass parameters
-        if algorithm == 'optimal':
-            result = find_optimal_tile_placement(
-                state, k_normal=nt, l_frozen=nf, 
-                max_attempts=params['max_iterations']
-            )
-        elif algorithm == 'greedy':
-            # Pass greedy-specific parameters
-            result = find_optimal_tile_placement(
-                state, k_normal=nt, l_frozen=nf, 
-                max_attempts=params['max_iterations']
-            )
-        elif algorithm == 'genetic':
-            # Pass genetic algorithm parameters
-            print("Note: Genetic algorithm not yet implemented, using optimal")
-            result = find_optimal_tile_placement(
-                state, k_normal=nt, l_frozen=nf, 
-                max_attempts=params.get('generations', 200) * params.get('population_size', 100) // 10
-            )
-        elif algorithm == 'simulated':
-            # Pass simulated annealing parameters
-            print("Note: Simulated annealing not yet implemented, using optimal")
-            result = find_optimal_tile_placement(
-                state, k_normal=nt, l_frozen=nf, 
-                max_attempts=params.get('max_iterations', 10000)
-            )
-        else:
-            result = find_optimal_tile_placement(state, k_normal=nt, l_frozen=nf, max_attempts=10000)
-        
+        monitor = SearchMonitor(deadline_ms=deadline)
+        with metrics.collect() as stats:
+            result, cache_hit = cached_solve(state, nt, nf, algorithm, params,
+                                             use_cache=solver_settings.get('use_cache', True), monitor=monitor,
+                                             seeds=seeds)
         t1 = time()
+        metrics.registry.record(stats, algorithm, t1 - t0)
         
         if result:
-            result.pop('best_grid', None)
+            result = dict(result)
             result['time_taken'] = f"{t1 - t0:.3f}s"
             result['algorithm_used'] = algorithm
             result['parameters_used'] = params
+            result['cache_hit'] = cache_hit
+            result['metrics'] = stats.as_dict()
             
             print(f"Solution found in {result['time_taken']} using {algorithm}")
-            return jsonify(result)
+            if fmt == 'binary':
+                return Response(encode_result(result, fmt), mimetype="application/octet-stream",
+                                headers={"X-Time-Taken": result['time_taken'], "X-Cache-Hit": str(cache_hit).lower()})
+            return jsonify(encode_result(result, fmt))
         else:
             return jsonify({
                 "error": "No optimal placement found",
@@ -238,6 +119,8 @@ def solve_maze():
                 "parameters_used": params
             }), 400
 
+    except InvalidState as e:
+        return jsonify({"error": f"Invalid request: {e}"}), 400
     except Exception as e:
         print(f"Error during solving: {str(e)}")
         import traceback
@@ -245,6 +128,176 @@ def solve_maze():
         return jsonify({"error": str(e)}), 500
 
 
+@app.route("/solver/stream", methods=["POST"])
+def solve_maze_stream():
+    """
+    Anytime variant of /solver: streams every improved layout while the search runs.
+
+    Events are server-sent events by default ("progress" per improvement, then one
+    "result" or "error"), or newline-delimited JSON objects with an "event" field when
+    solver_settings.stream_format is "ndjson". solver_settings.deadline_ms bounds the search
+    and response_format "flat" sends positions as flat lists.
+    """
+    data = request.get_json()
+    try:
+        solver_settings = validate_settings(data)
+        algorithm, params = resolve_params(solver_settings)
+        ndjson = solver_settings.get('stream_format') == 'ndjson'
+        fmt = response_format(solver_settings, ("json", "flat"))
+        deadline = deadline_ms(solver_settings)
+        state, nt, nf, froz = extract_state(data)
+        seeds = warm_start_seeds(data, state)
+    except Exception as e:
+        return jsonify({"error": f"Invalid game state: {e}"}), 400
+
+    events = queue.Queue()
+    t0 = time()
+    monitor = SearchMonitor(
+        deadline_ms=deadline,
+        on_improve=lambda best, normal, frozen: events.put(("progress", {
+            "best_score": best, "normal_positions": normal, "frozen_positions": frozen,
+            "elapsed": round(time() - t0, 3)
+        }))
+    )
+
+    def work():
+        try:
+            with metrics.collect() as stats:
+                result, cache_hit = cached_solve(state, nt, nf, algorithm, params,
+                                                 use_cache=solver_settings.get('use_cache', True), monitor=monitor,
+                                                 seeds=seeds)
+            metrics.registry.record(stats, algorithm, time() - t0)
+            if result:
+                result = dict(result, time_taken=f"{time() - t0:.3f}s", algorithm_used=algorithm,
+                              parameters_used=params, cache_hit=cache_hit, metrics=stats.as_dict())
+                events.put(("result", result))
+            else:
+                events.put(("error", {"error": "No optimal placement found", "algorithm_used": algorithm}))
+        except Exception as e:
+            events.put(("error", {"error": str(e)}))
+
+    def encode(event, payload):
+        payload = encode_result(payload, fmt)
+        if ndjson:
+            return json.dumps(dict(payload, event=event), default=str) + "\n"
+        return f"event: {event}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+    def stream():
+        threading.Thread(target=work, daemon=True).start()
+        try:
+            while True:
+                event, payload = events.get()
+                yield encode(event, payload)
+                if event != "progress":
+                    break
+        finally:
+            monitor.cancel()  # client went away or search finished
+
+    return Response(stream_with_context(stream()),
+                    mimetype="application/x-ndjson" if ndjson else "text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@app.route("/solver/batch", methods=["POST"])
+def solve_maze_batch():
+    """
+    Solve many boards in one request, streaming one NDJSON line per input in input order.
+
+    The body is a JSON array of /solver payloads, an object {"states": [...],
+    "solver_settings": {...}} whose settings apply to states without their own, or an
+    NDJSON body (Content-Type application/x-ndjson) with one payload per line.
+    Identical boards are solved once and unique boards are spread across cores. The
+    shared solver_settings.response_format "flat" sends positions as flat lists.
+    """
+    if request.mimetype == 'application/x-ndjson':
+        # Lines are decoded per payload, so a malformed one only fails its own entry
+        payloads = (line for line in request.stream if line.strip())
+        solver_settings = None
+    else:
+        data = request.get_json()
+        if isinstance(data, list):
+            payloads, solver_settings = data, None
+        elif isinstance(data, dict) and isinstance(data.get('states'), list):
+            payloads, solver_settings = data['states'], data.get('solver_settings')
+        else:
+            return jsonify({"error": "Expected a list of game states or {\"states\": [...]}"}), 400
+    try:
+        resolve_params(solver_settings)  # shared settings; each payload's own are checked per entry
+        fmt = response_format(solver_settings, ("json", "flat"))
+    except InvalidState as e:
+        return jsonify({"error": str(e)}), 400
+
+    def stream():
+        for entry in solve_batch(payloads, solver_settings,
+                                 workers=int(os.environ.get('SOLVER_BATCH_WORKERS', 0)) or None,
+                                 cache=solution_cache):
+            yield json.dumps(encode_result(entry, fmt), default=str) + "\n"
+
+    return Response(stream_with_context(stream()), mimetype="application/x-ndjson",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+def solve_job(payload, monitor):
+    """Job-queue entry point: the /solver pipeline for one payload, run in a worker process."""
+    solver_settings = payload.get('solver_settings', {})
+    algorithm, params = resolve_params(solver_settings)
+    state, nt, nf, froz = extract_state(payload)
+    seeds = warm_start_seeds(payload, state)
+    t0 = time()
+    with metrics.collect() as stats:
+        result, cache_hit = cached_solve(state, nt, nf, algorithm, params,
+                                         use_cache=solver_settings.get('use_cache', True), monitor=monitor,
+                                         seeds=seeds)
+    if not result:
+        raise ValueError("No optimal placement found")
+    # Jobs run in worker processes, so they report through their result rather than /metrics
+    return dict(result, time_taken=f"{time() - t0:.3f}s", algorithm_used=algorithm,
+                parameters_used=params, cache_hit=cache_hit, metrics=stats.as_dict())
+
+# Long solves run here instead of in the request thread
+job_queue = JobQueue(solve_job, workers=int(os.environ.get('SOLVER_JOB_WORKERS', 2)),
+                     max_pending=int(os.environ.get('SOLVER_JOB_MAX_PENDING', 100)))
+
+
+@app.route("/jobs", methods=["POST"])
+def submit_job():
+    data = request.get_json()
+    try:
+        extract_state(data)
+        solver_settings = validate_settings(data)
+        deadline_ms(solver_settings)
+        resolve_params(solver_settings)
+        parse_seeds(data)
+    except Exception as e:
+        return jsonify({"error": f"Invalid game state: {e}"}), 400
+    job_id = job_queue.submit(data)
+    if job_id is None:
+        return jsonify({"error": "Too many pending jobs, retry later"}), 503
+    return jsonify({"job_id": job_id, "status": "queued"}), 202
+
+
+@app.route("/jobs/<job_id>", methods=["GET"])
+def job_status(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
+    return jsonify(job)
+
+
+@app.route("/jobs/<job_id>", methods=["DELETE"])
+def cancel_job(job_id):
+    job = job_queue.cancel(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
+    return jsonify(job)
+
+
+@app.route('/metrics', methods=['GET'])
+def solver_metrics():
+    """Prometheus text exposition of solver counters and phase timings for this process."""
+    return Response(metrics.registry.render(), mimetype="text/plain; version=0.0.4")
+
+
 @app.route('/available', methods=['GET'])
 def available_options():
     """Return available algorithms and their dynamic parameter configurations"""
@@ -0,0 +1,24 @@
+import batch
+
+def make_state(towers=1, **settings):
+    return {"board": {"height": 6, "width": 6, "staticTowers": [],
+                      "startArea": [{"x": -1, "y": 0}, {"x": -1, "y": 1}],
+                      "endArea": [{"x": 6, "y": 4}, {"x": 6, "y": 5}]},
+            "towers": towers, "claps": 0,
+            "solver_settings": dict({"algorithm": "greedy", "max_iterations": 500}, **settings)}
+
+def test_inline_solver_failure_stays_per_entry(monkeypatch):
+    solve = batch.run_solver
+
+    def run_solver(state, nt, nf, algorithm, params, **kwargs):
+        if params['greediness'] == 0.5:
+            raise ZeroDivisionError("solver blew up")
+        return solve(state, nt, nf, algorithm, params, **kwargs)
+
+    monkeypatch.setattr(batch, 'run_solver', run_solver)
+    payloads = [make_state(), make_state(greediness=0.5), make_state(towers=2)]
+    entries = list(batch.solve_batch(payloads, workers=1))
+    assert [e['index'] for e in entries] == [0, 1, 2]
+    assert entries[1] == {"index": 1, "error": "solver blew up"}
+    assert 'error' not in entries[0] and 'error' not in entries[2]
+    assert entries[2]['best_score'] >= entries[2]['original_score']
@@ -1,106 +1,178 @@
 from collections import deque
-import math,copy,random
-import matplotlib.pyplot as plt
+import math,copy,random,heapq,os
+from time import perf_counter
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np,json
-from tqdm import tqdm
-from matplotlib.colors import ListedColormap, BoundaryNorm
+import metrics
+from paths import optimize_diagonal_path
+from wire import validate_header, validate_area, InvalidState
 
 def extract_state(raw):
-    n=raw['board']['height']
-    m=raw['board']['width']
+    """
+    Game-state payload -> (int8 board, normal tile count, frozen tile count, frozen tower centers).
+
+    Validation and the board writes share one pass over the static towers; a malformed
+    payload raises InvalidState (a ValueError).
+    """
+    b,n,m,towers,claps=validate_header(raw)
+    board=np.zeros((n,m),dtype=np.int8)
     frozen=[]
-    board=np.zeros((n,m))
-    for t in raw['board']['staticTowers']:
-        x=t['coord']['x']
-        y=t['coord']['y']
-        if t['clap']: 
-            board[y:y+2,x:x+2]=2
-            frozen+=[(y+0.5,x+0.5)]
-        else: board[y:y+2,x:x+2]=1
+    try:
+        for t in b['staticTowers']:
+            x=t['coord']['x']
+            y=t['coord']['y']
+            if type(x) is not int or type(y) is not int or not (0<=x<=m-2 and 0<=y<=n-2):
+                raise InvalidState(f"board.staticTowers tower {(x, y)} does not fit on the board")
+            if t['clap']:
+                board[y:y+2,x:x+2]=2
+                frozen+=[(y+0.5,x+0.5)]
+            else: board[y:y+2,x:x+2]=1
+    except (KeyError,TypeError):
+        raise InvalidState("board.staticTowers has a tower without coord.x, coord.y and clap") from None
     def special(area,start=False):
         if len(area)==2:
-            xs=[i['x'] for i in area]
-            ys=[i['y'] for i in area]
+            xs=[x for x,_ in area]
+            ys=[y for _,y in area]
             if -1 in xs or m in xs:
                 board[min(ys):max(ys)+1,min(m-1,max(0,xs[0]))]=-1 if start else -2
             if -1 in ys or n in ys:
                 board[min(n-1,max(0,ys[0])),min(xs):max(xs)+1]=-1 if start else -2
         else:
-            x= 0 if min([i['x'] for i in area])==-1 else m-1
-            y= 0 if min([i['y'] for i in area])==-1 else n-1
+            x= 0 if min([x for x,_ in area])==-1 else m-1
+            y= 0 if min([y for _,y in area])==-1 else n-1
             board[y,x]=-1 if start else -2
-    special(raw['board']['startArea'],True)
-    special(raw['board']['endArea'],False)
-    return board,raw['towers']-raw['claps'],raw['claps'],frozen
+    special(validate_area(b['startArea'],'startArea',n,m),True)
+    special(validate_area(b['endArea'],'endArea',n,m),False)
+    return board,towers-claps,claps,frozen
 
 def extract_frozen(grid):
-    frozen_centers = []
-    n,m =grid.shape
-    # Scan for 2x2 blocks of 2's, checking only potential top-left corners
-    for i in range(n-1):
-        for j in range(m-1):
-            if (grid[i][j] in {2,4} and grid[i][j+1] in {2,4} and 
-                grid[i+1][j] in {2,4} and grid[i+1][j+1] in {2,4}):
-                # Center of 2x2 tile is at (i+0.5, j+0.5)
-                frozen_centers.append((i + 0.5, j + 0.5))
-    return frozen_centers
+    # Every top-left corner of a 2x2 block made of 2's/4's; center is at (i+0.5, j+0.5)
+    grid=np.asarray(grid)
+    rows, cols = np.nonzero(window_mask((grid == 2) | (grid == 4)))
+    return [(i + 0.5, j + 0.5) for i, j in zip(rows.tolist(), cols.tolist())]
 
-def visualize_grid(grid,path=None,highlight_cells=None):
+def window_mask(mask):
+    """For a boolean cell mask, mark the top-left corners of 2x2 windows that are fully set."""
+    return mask[..., :-1, :-1] & mask[..., :-1, 1:] & mask[..., 1:, :-1] & mask[..., 1:, 1:]
+
+def reachable_mask(grid):
+    """Cells connected to a start (-1) cell through passable (value <= 0) cells."""
+    grid = np.asarray(grid)
+    passable = grid <= 0
+    reach = grid == -1
+    while True:
+        grown = reach.copy()
+        grown[1:] |= reach[:-1]
+        grown[:-1] |= reach[1:]
+        grown[:, 1:] |= reach[:, :-1]
+        grown[:, :-1] |= reach[:, 1:]
+        grown &= passable
+        if (grown == reach).all():
+            return reach
+        reach = grown
+
+class TileGrid:
     """
-    Visualize the processed grid with custom colors for each value.
-    """
-    # Define a mapping from tile values to custom colors
-    color_dict = {
-        0: "#9ee3f5",  # light gray for Empty
-        1: "#f42121",  # red for Red Block
-        2: "#3B59EF",  # blue for Frost
-        3:"#65737E",
-        4:"#2F3068",
-        -1:"#3DF659", #start
-        -2:"#FFAD1F" #end
-        # Add more if needed
-    }
-
-    # Create a color list ordered by sorted keys of color_dict
-    value_list = sorted(color_dict.keys())
-    color_list = [color_dict[val] for val in value_list]
-
-    # Create colormap and norm
-    cmap = ListedColormap(color_list)
-    norm = BoundaryNorm(boundaries=[v - 0.5 for v in value_list] + [value_list[-1] + 0.5], ncolors=len(color_list))
-
-    plt.figure(figsize=(12, 8))
-    im = plt.imshow(grid, cmap=cmap, norm=norm, interpolation='nearest')
-    cbar = plt.colorbar(im, ticks=value_list)
-    cbar.ax.set_yticklabels([f'{val} ({label})' for val, label in zip(value_list, ['Empty', 'Normal Fixed', 'Frost fixed','Normal Movable','Frost Movable','Start','End'])])
-
-    plt.title('Processed Game Grid')
-    plt.xlabel('Column')
-    plt.ylabel('Row')
-
-    # Add grid lines
-    for i in range(grid.shape[1] + 1):
-        plt.axvline(i - 0.5, color='white', linewidth=0.5, alpha=0.85)
-    for i in range(grid.shape[0] + 1):
-        plt.axhline(i - 0.5, color='white', linewidth=0.5, alpha=0.85)
-
-    # Plot path if provided
-    if path:
-        rows, cols = zip(*path)
-        plt.plot(cols, rows, color='black', linewidth=2, marker='o', markersize=4, label='Path')
-        plt.legend()
-    
-    # Plot red dots at highlighted cells
-    if highlight_cells:
-        highlight_rows, highlight_cols = zip(*highlight_cells)
-        plt.scatter(highlight_cols, highlight_rows, color='red', s=50, zorder=5, label='Highlighted Cells')
+    Compact int8 board used as a scratch buffer by the search loops.
+
+    Tiles are written in place with place() and reverted with undo(), so a search
+    mutates a single array instead of deep-copying the board for every candidate.
+    """
+    OFFSETS_R = np.array([0, 0, 1, 1])
+    OFFSETS_C = np.array([0, 1, 0, 1])
+
+    def __init__(self, grid):
+        self.cells = np.array(grid, dtype=np.int8)
+        self._history = []
+
+    @property
+    def shape(self):
+        return self.cells.shape
+
+    def free_mask(self):
+        """Top-left corners where a 2x2 tile fits on empty cells."""
+        return window_mask(self.cells == 0)
+
+    def place(self, positions, tile_type):
+        """Write 2x2 tiles at the given top-left positions; revert with undo()."""
+        if len(positions) == 0:
+            self._history.append(None)
+            return
+        pos = np.asarray(positions).reshape(-1, 2)
+        rows = (pos[:, :1] + self.OFFSETS_R).ravel()
+        cols = (pos[:, 1:] + self.OFFSETS_C).ravel()
+        self._history.append((rows, cols, self.cells[rows, cols]))
+        self.cells[rows, cols] = tile_type
 
+    def undo(self):
+        """Revert the most recent place() call."""
+        change = self._history.pop()
+        if change is not None:
+            rows, cols, previous = change
+            self.cells[rows, cols] = previous
 
-    plt.tight_layout()
-    plt.show()
+    def copy(self):
+        return self.cells.copy()
+
+class FrostCoverage:
+    """
+    Per-cell index of which cells lie within `radius` of a frost center.
+
+    Frost centers are the same 2x2 windows extract_frozen reports. The index keeps a
+    count of covering centers per cell, so candidate frost tiles can be added and
+    removed in O(1) NumPy slices instead of rescanning the board.
+    """
+
+    def __init__(self, grid, radius=3):
+        grid = np.asarray(grid)
+        self.k = k = math.ceil(radius)
+        offsets = np.arange(1 - k, k + 1) - 0.5
+        # stencil[a, b] covers cell (r + a + 1 - k, c + b + 1 - k) for the center of window (r, c)
+        self.stencil = (offsets[:, None] ** 2 + offsets[None, :] ** 2 < radius ** 2).astype(np.int16)
+        self.frost = (grid == 2) | (grid == 4)
+        self.centers = window_mask(self.frost)
+        n, m = grid.shape
+        self._count = np.zeros((n + 2 * k, m + 2 * k), dtype=np.int16)
+        for a, b in zip(*np.nonzero(self.stencil)):
+            self._count[a + 1:a + n, b + 1:b + m] += self.centers
+        self.count = self._count[k:k + n, k:k + m]
+
+    def _update_center(self, i, j, on):
+        if self.centers[i, j] != on:
+            self.centers[i, j] = on
+            k = self.k
+            self._count[i + 1:i + 1 + 2 * k, j + 1:j + 1 + 2 * k] += self.stencil if on else -self.stencil
+
+    def _set(self, positions, value):
+        n, m = self.centers.shape
+        for r, c in positions:
+            self.frost[r:r + 2, c:c + 2] = value
+            # Only windows overlapping this tile can change
+            for i in range(max(0, r - 1), min(n, r + 2)):
+                for j in range(max(0, c - 1), min(m, c + 2)):
+                    self._update_center(i, j, bool(self.frost[i:i + 2, j:j + 2].all()))
+
+    def add(self, positions):
+        """Register frost tiles at the given top-left positions."""
+        self._set(positions, True)
+
+    def remove(self, positions):
+        """Remove frost tiles previously registered with add()."""
+        self._set(positions, False)
+
+    def covered(self, cell):
+        return self.count[cell[0], cell[1]] > 0
+
+def visualize_grid(grid,path=None,highlight_cells=None):
+    """Plot the grid with matplotlib (debug only; the plotting layer is imported lazily)."""
+    from viz import visualize_grid as show
+    show(grid,path,highlight_cells)
 
 def min_distance(grid):
     """Find minimum distance between any -1 cell and any -2 cell."""
+    metrics.current().inc('bfs_calls')
+    if isinstance(grid, np.ndarray):
+        grid = grid.tolist()  # plain lists index far faster than NumPy scalars
     m, n = len(grid), len(grid[0])
     queue = deque()
     visited = set()
@@ -135,7 +207,7 @@ def min_distance(grid):
             
             if (0 <= nr < m and 0 <= nc < n and 
                 (nr, nc) not in visited and 
-                grid[nr][nc] not in [1, 2, 3, 4]):
+                grid[nr][nc] not in (1, 2, 3, 4)):
                 
                 queue.append((nr, nc, dist + 1))
                 visited.add((nr, nc))
@@ -143,50 +215,136 @@ def min_distance(grid):
     return -1, []
 
 def score(state,r=3,d=5,t=1,c=2):
-    froz=extract_frozen(state)
+    metrics.current().inc('score_calls')
     dist,path=min_distance(state)
     if dist==-1:return -1
+    return path_score(state,path,r,d,t,c)
+
+def path_score(state,path,r=3,d=5,t=1,c=2,coverage=None):
+    """Score an already computed (diagonal-optimized) path on the given grid.
+    coverage: optional FrostCoverage kept in sync with state by the caller."""
+    if coverage is None:
+        coverage=FrostCoverage(state,r)
+    return _covered_path_score(coverage.count,path,d,t,c)
+
+def _covered_path_score(covered,path,d=5,t=1,c=2):
     frozen=d
     score=0
     for i in range(len(path)):
-        for f in froz:
-            if l2norm(f,path[i])<3:
-                frozen+=d
-                break
+        if covered[path[i]]:
+            frozen+=d
         if frozen>0:
             score+=t*c
             frozen-=1
         elif i>0:score+=t*l2norm(path[i-1],path[i])
     return score
 
-def optimize_diagonal_path(path):
-    """Optimize path by replacing two orthogonal moves with diagonal when possible."""
-    if len(path) < 3:
-        return path
-    
-    optimized = [path[0]]
-    i = 1
-    
-    while i < len(path) - 1:
-        curr = path[i-1]
-        next1 = path[i]
-        next2 = path[i+1]
-        
-        dr1, dc1 = next1[0] - curr[0], next1[1] - curr[1]
-        dr2, dc2 = next2[0] - next1[0], next2[1] - next1[1]
-        
-        if (abs(dr1) + abs(dc1) == 1 and abs(dr2) + abs(dc2) == 1 and 
-            dr1 != dr2 and dc1 != dc2):
-            optimized.append(next2)
-            i += 2
-        else:
-            optimized.append(next1)
-            i += 1
-    
-    if i == len(path) - 1:
-        optimized.append(path[-1])
-    
-    return optimized
+def frost_counts(boards, radius=3):
+    """FrostCoverage(board, radius).count for every board of an (N, H, W) stack at once."""
+    boards = np.asarray(boards)
+    n, m = boards.shape[-2:]
+    k = math.ceil(radius)
+    offsets = np.arange(1 - k, k + 1) - 0.5
+    stencil = offsets[:, None] ** 2 + offsets[None, :] ** 2 < radius ** 2
+    centers = window_mask((boards == 2) | (boards == 4)).astype(np.int16)
+    count = np.zeros(boards.shape[:-2] + (n + 2 * k, m + 2 * k), dtype=np.int16)
+    for a, b in zip(*np.nonzero(stencil)):
+        count[..., a + 1:a + n, b + 1:b + m] += centers
+    return count[..., k:k + n, k:k + m]
+
+def batch_min_distance(boards):
+    """
+    min_distance for every board of an (N, H, W) stack, by level-synchronous BFS on all boards at once.
+
+    Each frontier cell carries its rank in min_distance's queue order; a new cell takes the
+    neighbour with the smallest (rank, direction) as parent, which is the one the FIFO
+    queue would have reached it from, so distances and paths (ties included) match.
+
+    Returns:
+        list of (dist, optimized_path) tuples, (-1, []) for boards without a path
+    """
+    boards = np.asarray(boards)
+    if boards.ndim == 2:
+        boards = boards[None]
+    count, n, m = boards.shape
+    metrics.current().inc('bfs_calls', count)
+    shape = boards.shape
+    passable = ~np.isin(boards, (1, 2, 3, 4))
+    ends = boards == -2
+    frontier = boards == -1
+    visited = frontier.copy()
+    rank = (np.cumsum(frontier.reshape(count, -1), axis=1, dtype=np.int32) - 1).reshape(shape)
+    parent_dir = np.zeros(shape, dtype=np.int8)
+    dist = np.full(count, -1)
+    end = np.zeros(count, dtype=np.int64)
+    active = frontier.any(axis=(1, 2))
+    none = 1 << 30  # larger than any rank * 4 + direction
+    candidates = np.empty((4,) + shape, dtype=np.int32)
+    level = 0
+    while active.any():
+        hit = frontier & ends
+        arrived = hit.any(axis=(1, 2)) & active
+        if arrived.any():
+            # First end cell dequeued at this level = the one with the smallest rank
+            end[arrived] = np.where(hit[arrived], rank[arrived], none).reshape(int(arrived.sum()), -1).argmin(axis=1)
+            dist[arrived] = level
+            active &= ~arrived
+            frontier &= active[:, None, None]
+        source = np.where(frontier, rank * 4, none)
+        candidates.fill(none)
+        for d, (dr, dc) in enumerate(IncrementalPathEvaluator.DIRECTIONS):
+            # candidates[d] at a cell = parent key if it was entered by moving (dr, dc)
+            candidates[d, :, max(dr, 0):n + min(dr, 0), max(dc, 0):m + min(dc, 0)] = \
+                source[:, max(-dr, 0):n + min(-dr, 0), max(-dc, 0):m + min(-dc, 0)] + d
+        key = candidates.min(axis=0)
+        frontier = (key < none) & passable & ~visited
+        if not frontier.any():
+            break
+        visited |= frontier
+        parent_dir[frontier] = key[frontier] & 3
+        # Re-rank the new frontier per board by (parent rank, direction)
+        b, k = np.nonzero(frontier.reshape(count, -1))
+        order = np.argsort(b.astype(np.int64) * none + key.reshape(count, -1)[b, k], kind='stable')
+        group = b[order]
+        rank = np.zeros(shape, dtype=np.int32)
+        rank.reshape(count, -1)[group, k[order]] = np.arange(len(order)) - np.searchsorted(group, group)
+        level += 1
+    # Walk all parent chains back together, filling each path from its end
+    found = np.nonzero(dist != -1)[0]
+    longest = int(dist.max()) if len(found) else 0
+    steps = np.array([dr * m + dc for dr, dc in IncrementalPathEvaluator.DIRECTIONS])
+    flat_dirs = parent_dir.reshape(count, -1)[found]
+    lengths = dist[found]
+    cells = np.zeros((len(found), longest + 1), dtype=np.int64)
+    cur = end[found]
+    rows = np.arange(len(found))
+    for s in range(longest + 1):
+        alive = lengths >= s
+        cells[alive, lengths[alive] - s] = cur[alive]
+        cur = np.where(lengths > s, cur - steps[flat_dirs[rows, cur]], cur)
+    results = [(-1, [])] * count
+    for i, length, row in zip(found.tolist(), lengths.tolist(), cells.tolist()):
+        results[i] = (length, optimize_diagonal_path([divmod(k, m) for k in row[:length + 1]]))
+    return results
+
+def batch_score(boards, r=3, d=5, t=1, c=2):
+    """score() of every board of an (N, H, W) stack; -1 where a board has no path."""
+    boards = np.asarray(boards)
+    if boards.ndim == 2:
+        boards = boards[None]
+    covered = frost_counts(boards, r)
+    return [_covered_path_score(covered[i], path, d, t, c) if dist != -1 else -1
+            for i, (dist, path) in enumerate(batch_min_distance(boards))]
+
+def stack_layouts(grid, layouts):
+    """(N, H, W) stack of the base grid with each (normal_positions, frozen_positions) layout applied."""
+    boards = np.repeat(np.asarray(grid, dtype=np.int8)[None], len(layouts), axis=0)
+    for board, (normal_positions, frozen_positions) in zip(boards, layouts):
+        for (row, col) in normal_positions:
+            board[row:row + 2, col:col + 2] = 3
+        for (row, col) in frozen_positions:
+            board[row:row + 2, col:col + 2] = 4
+    return boards
 
 def l2norm(p, q):
     return math.sqrt((p[0]-q[0])**2+(p[1]-q[1])**2)
@@ -207,6 +365,10 @@ def can_place_2x2_tile(grid, top_row, left_col):
 
 def place_2x2_tile(grid, top_row, left_col, tile_type):
     """Place a 2x2 tile at the given position. tile_type: 1 for normal, 2 for frozen."""
+    if isinstance(grid, np.ndarray):
+        new_grid = grid.copy()
+        new_grid[top_row:top_row + 2, left_col:left_col + 2] = tile_type
+        return new_grid
     new_grid = copy.deepcopy(grid)
     for i in range(2):
         for j in range(2):
@@ -215,29 +377,462 @@ def place_2x2_tile(grid, top_row, left_col, tile_type):
 
 def get_valid_2x2_positions(grid):
     """Get all valid positions where a 2x2 tile can be placed."""
-    valid_positions = []
-    m, n = len(grid), len(grid[0])
-    
-    for i in range(m - 1):
-        for j in range(n - 1):
-            if can_place_2x2_tile(grid, i, j):
-                valid_positions.append((i, j))
-    return valid_positions
-
-def check_positions_overlap(positions):
-    """Check if any 2x2 tile positions overlap."""
-    occupied_cells = set()
-    for pos in positions:
-        top_row, left_col = pos
-        for i in range(2):
-            for j in range(2):
-                cell = (top_row + i, left_col + j)
-                if cell in occupied_cells:
-                    return True
-                occupied_cells.add(cell)
-    return False
-
-def place_tiles_optimally(grid, k_normal, l_frozen, max_attempts=2000,dbg=False):
+    rows, cols = np.nonzero(TileGrid(grid).free_mask())
+    return list(zip(rows.tolist(), cols.tolist()))
+
+class IncrementalPathEvaluator:
+    """
+    Incremental re-evaluation of min_distance for candidate tile placements.
+
+    Keeps the BFS distance field and parent tree of the base grid. Candidates whose
+    tiles miss the cached shortest path get the cached answer back in O(tiles);
+    otherwise only the BFS subtree hanging below the blocked cells is recomputed, or
+    the whole search reruns when that subtree is most of the tree (FULL_SEARCH_SHARE).
+    Every cell also keeps its BFS order key (start index followed by the direction
+    taken at each step), so repaired paths break ties exactly like min_distance.
+    """
+    BLOCKED = (1, 2, 3, 4)
+    DIRECTIONS = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+    # A cut that invalidates more than this share of the reached cells gets a plain BFS
+    # instead of a repair: the heap-ordered repair costs several times a FIFO step, so
+    # it only pays off for small subtrees (0.25 was fastest or within 15% on the bench corpus)
+    FULL_SEARCH_SHARE = 0.25
+    # Whole-board engine for cache misses whose caller passes the tiled grid: grid ->
+    # min_distance's exact result, or None when it cannot run. Set at the end of this module.
+    board_search = None
+
+    def __init__(self, grid):
+        self.m, self.n = len(grid), len(grid[0])
+        m, n = self.m, self.n
+        cells = np.asarray(grid).ravel().tolist()
+        self.ends = {k for k, v in enumerate(cells) if v == -2}
+        self.passable = [v not in self.BLOCKED for v in cells]
+        self.starts = [k for k, v in enumerate(cells) if v == -1]
+        self.neighbors = []
+        for k in range(m * n):
+            r, c = divmod(k, n)
+            self.neighbors.append([((r + dr) * n + c + dc, d) for d, (dr, dc) in enumerate(self.DIRECTIONS)
+                                   if 0 <= r + dr < m and 0 <= c + dc < n])
+        self.dist = [-1] * (m * n)
+        self.parent = [-1] * (m * n)
+        self.key = [None] * (m * n)
+        self.children = [[] for _ in range(m * n)]
+        metrics.current().inc('bfs_calls')
+        queue = deque(self.starts)
+        for i, k in enumerate(queue):
+            self.dist[k], self.key[k] = 0, (i,)
+        # Full BFS in the same queue order as min_distance, so the first end cell
+        # popped (and thus the cached path) is exactly what min_distance returns.
+        end = -1
+        while queue:
+            k = queue.popleft()
+            if end == -1 and cells[k] == -2:
+                end = k
+            for nk, d in self.neighbors[k]:
+                if self.dist[nk] == -1 and self.passable[nk]:
+                    self.dist[nk] = self.dist[k] + 1
+                    self.parent[nk] = k
+                    self.key[nk] = self.key[k] + (d,)
+                    self.children[k].append(nk)
+                    queue.append(nk)
+        if end == -1:
+            self.base_dist, self.base_path, self.path_cells = -1, [], set()
+        else:
+            self.base_dist = self.dist[end]
+            self.path_cells = set(self._trace(end, {}))
+            self.base_path = optimize_diagonal_path(self._trace(end, {}))
+        self.reached = sum(d != -1 for d in self.dist)
+        self.cache_hits = 0
+        self.repairs = 0
+        self.full_searches = 0
+
+    def _trace(self, k, parent):
+        """Walk parents back to a start cell, preferring repaired parents over the base tree."""
+        path = []
+        while k != -1:
+            path.append(k)
+            k = parent[k] if k in parent else self.parent[k]
+        return [divmod(k, self.n) for k in reversed(path)]
+
+    def blocked_cells(self, positions):
+        """Flat indices of the cells covered by 2x2 tiles at the given top-left positions."""
+        n = self.n
+        return {(r + i) * n + c + j for r, c in positions for i in range(2) for j in range(2)}
+
+    def min_distance(self, positions, grid=None):
+        """
+        Same result as min_distance on the base grid with tiles added at positions;
+        grid, that board already tiled, lets a cache miss go to board_search instead.
+        """
+        if self.base_dist == -1:
+            return -1, []
+        blocked = self.blocked_cells(positions)
+        if not any(divmod(k, self.n) in self.path_cells for k in blocked):
+            # Blocking cells only lengthens paths and only delays other cells in the
+            # BFS order, so the cached path is still the one min_distance would find.
+            self.cache_hits += 1
+            metrics.current().inc('path_cache_hits')
+            return self.base_dist, self.base_path
+        if grid is not None and self.board_search is not None:
+            found = self.board_search(grid)
+            if found is not None:
+                self.full_searches += 1
+                return found
+        self.repairs += 1
+        return self._repair(blocked)
+
+    def _repair(self, blocked):
+        # Every cell whose BFS-tree ancestry goes through a blocked cell is stale;
+        # all other cells keep both their distance and their BFS order key.
+        affected = set()
+        stack = [k for k in blocked if self.dist[k] != -1]
+        while stack:
+            k = stack.pop()
+            affected.add(k)
+            stack.extend(self.children[k])
+        if len(affected) > self.FULL_SEARCH_SHARE * self.reached:
+            self.full_searches += 1
+            metrics.current().inc('bfs_calls')
+            return self._search(blocked)
+        metrics.current().inc('bfs_repairs')
+        heap = []
+        for k in affected:
+            if k in blocked:
+                continue
+            for nk, d in self.neighbors[k]:
+                if nk not in affected and self.dist[nk] != -1:
+                    heap.append((self.dist[nk] + 1, self.key[nk] + (d ^ 1,), k, nk))
+        heapq.heapify(heap)
+        # Dijkstra over the stale region ordered by (distance, BFS key) reproduces the FIFO order.
+        dist, key, parent = {}, {}, {}
+        while heap:
+            dk, kk, k, p = heapq.heappop(heap)
+            if k in dist:
+                continue
+            dist[k], key[k], parent[k] = dk, kk, p
+            for nk, d in self.neighbors[k]:
+                if nk in affected and nk not in blocked and nk not in dist:
+                    heapq.heappush(heap, (dk + 1, kk + (d,), nk, k))
+        best = None
+        for k in self.ends:
+            if k in affected:
+                if k not in dist:
+                    continue
+                cand = (dist[k], key[k], k)
+            elif self.dist[k] != -1:
+                cand = (self.dist[k], self.key[k], k)
+            else:
+                continue
+            if best is None or cand < best:
+                best = cand
+        if best is None:
+            return -1, []
+        return best[0], optimize_diagonal_path(self._trace(best[2], parent))
+
+    def _search(self, blocked):
+        """Plain BFS on the flat board with extra blocked cells, in min_distance order."""
+        parent = {k: -1 for k in self.starts}
+        queue = deque(self.starts)
+        passable, ends = self.passable, self.ends
+        while queue:
+            k = queue.popleft()
+            if k in ends:
+                path = self._trace(k, parent)
+                return len(path) - 1, optimize_diagonal_path(path)
+            for nk, d in self.neighbors[k]:
+                if nk not in parent and passable[nk] and nk not in blocked:
+                    parent[nk] = k
+                    queue.append(nk)
+        return -1, []
+
+    def score(self, grid, positions, r=3, d=5, t=1, c=2, coverage=None):
+        """Equivalent of score(grid) where grid is the base grid plus tiles at positions."""
+        dist, path = self.min_distance(positions, grid)
+        if dist == -1:
+            return -1
+        return path_score(grid, path, r, d, t, c, coverage)
+
+class SearchMonitor:
+    """
+    Deadline and progress hook shared by the search engines.
+
+    Engines poll expired() inside their loops and stop with their best layout so far
+    once deadline_ms has passed or cancel() was called; improved() forwards every
+    strictly better layout to on_improve(score, normal_positions, frozen_positions).
+    """
+
+    def __init__(self, deadline_ms=None, on_improve=None):
+        self.deadline = perf_counter() + deadline_ms / 1000 if deadline_ms else None
+        self.on_improve = on_improve
+        self.best_score = float('-inf')
+        self.timed_out = False
+        self.cancelled = False
+
+    def expired(self):
+        if self.deadline is not None and not self.timed_out and perf_counter() > self.deadline:
+            self.timed_out = True
+        return self.timed_out or self.cancelled
+
+    def cancel(self):
+        """Make the running search stop at its next expired() check."""
+        self.cancelled = True
+
+    def improved(self, score, normal_positions, frozen_positions):
+        if score > self.best_score:
+            self.best_score = score
+            if self.on_improve:
+                self.on_improve(score, list(normal_positions), list(frozen_positions))
+
+class LayoutScorer:
+    """
+    Scores tile layouts on a fixed base grid without copying it.
+
+    Bundles the scratch TileGrid, the FrostCoverage index and the
+    IncrementalPathEvaluator that every search engine keeps in sync by hand otherwise.
+    Scores are memoized by a Zobrist signature of the layout (XOR of one random 64-bit
+    key per tile position and type), so a layout drawn again in any tile order is
+    scored once; the memo holds at most memo_size layouts, oldest evicted first.
+    """
+    BATCH_MIN = 32
+
+    def __init__(self, grid, memo_size=50000):
+        self.grid = grid
+        self.scratch = TileGrid(grid)
+        self.coverage = FrostCoverage(grid)
+        self.evaluator = IncrementalPathEvaluator(grid)
+        self.evaluations = 0
+        self.memo = {}
+        self.memo_size = memo_size
+        self.memo_hits = 0
+        self.zobrist = np.random.default_rng(0x5eed).integers(
+            1, 2 ** 63, size=(2,) + self.scratch.shape, dtype=np.int64).tolist()
+
+    def signature(self, normal_positions, frozen_positions):
+        normal_keys, frozen_keys = self.zobrist
+        key = 0
+        for r, c in normal_positions:
+            key ^= normal_keys[r][c]
+        for r, c in frozen_positions:
+            key ^= frozen_keys[r][c]
+        return key
+
+    def _remember(self, key, value):
+        memo = self.memo
+        memo[key] = value
+        if len(memo) > self.memo_size:
+            del memo[next(iter(memo))]
+
+    def score(self, normal_positions, frozen_positions):
+        """score() of the base grid with normal (3) and frozen (4) tiles added; -1 if blocked."""
+        key = self.signature(normal_positions, frozen_positions)
+        cached = self.memo.get(key)
+        stats = metrics.current()
+        stats.inc('memo_lookups')
+        if cached is not None:
+            self.memo_hits += 1
+            stats.inc('memo_hits')
+            return cached
+        current_score = self._evaluate(normal_positions, frozen_positions)
+        self._remember(key, current_score)
+        return current_score
+
+    def _evaluate(self, normal_positions, frozen_positions):
+        self.evaluations += 1
+        metrics.current().inc('layout_evaluations')
+        scratch, coverage = self.scratch, self.coverage
+        scratch.place(normal_positions, 3)
+        scratch.place(frozen_positions, 4)
+        coverage.add(frozen_positions)
+        current_score = self.evaluator.score(scratch.cells, list(normal_positions) + list(frozen_positions),
+                                             coverage=coverage)
+        coverage.remove(frozen_positions)
+        scratch.undo()
+        scratch.undo()
+        return current_score
+
+    def score_batch(self, layouts):
+        """
+        Score a list of (normal_positions, frozen_positions) layouts, each distinct layout once.
+
+        Layouts already in the memo are not rescored. When at least BATCH_MIN distinct
+        layouts are left they go through batch_score as one (N, H, W) stack; fewer use
+        the incremental evaluator.
+        """
+        keys = [self.signature(n, f) for n, f in layouts]
+        seen = {}
+        for key, layout in zip(keys, layouts):
+            seen.setdefault(key, layout)
+        stats = metrics.current()
+        stats.inc('memo_lookups', len(seen))
+        missing = [key for key in seen if key not in self.memo]
+        self.memo_hits += len(seen) - len(missing)
+        stats.inc('memo_hits', len(seen) - len(missing))
+        scores = {key: self.memo[key] for key in seen if key in self.memo}
+        if len(missing) >= self.BATCH_MIN:
+            self.evaluations += len(missing)
+            stats.inc('layout_evaluations', len(missing))
+            fresh = batch_score(stack_layouts(self.grid, [seen[key] for key in missing]))
+            for key, value in zip(missing, fresh):
+                self._remember(key, value)
+                scores[key] = value
+        else:
+            for key in missing:
+                scores[key] = self._evaluate(*seen[key])
+                self._remember(key, scores[key])
+        return [scores[key] for key in keys]
+
+    def grid_with(self, normal_positions, frozen_positions):
+        """A standalone copy of the base grid with the layout applied."""
+        self.scratch.place(normal_positions, 3)
+        self.scratch.place(frozen_positions, 4)
+        new_grid = self.scratch.copy()
+        self.scratch.undo()
+        self.scratch.undo()
+        return new_grid
+
+def _bfs_distances(grid, sources):
+    """Flat BFS distance list (-1 = unreachable) from the given flat source cells."""
+    m, n = grid.shape
+    passable = (grid <= 0).ravel().tolist()
+    dist = [-1] * (m * n)
+    queue = deque()
+    for k in sources:
+        dist[k] = 0
+        queue.append(k)
+    while queue:
+        k = queue.popleft()
+        r, c = divmod(k, n)
+        for nk in ((k + 1) if c + 1 < n else -1, (k - 1) if c > 0 else -1,
+                   (k + n) if r + 1 < m else -1, (k - n) if r > 0 else -1):
+            if nk != -1 and dist[nk] == -1 and passable[nk]:
+                dist[nk] = dist[k] + 1
+                queue.append(nk)
+    return dist
+
+class CandidateRanker:
+    """
+    Ranks valid 2x2 anchors by how much a tile there can lengthen the shortest path.
+
+    Computes the start-to-end shortest-path DAG (cells on some shortest path) and its
+    bottlenecks (DAG layers one cell wide, crossed by every shortest path). Each anchor
+    is then weighted by the exact distance gain of a lone tile there (3 per step),
+    touching a bottleneck (2), touching the DAG (1) and frost reach over the DAG (1).
+    Anchors whose lone tile disconnects start from end are dropped.
+    """
+
+    def __init__(self, grid, valid_positions=None, radius=3):
+        grid = np.asarray(grid)
+        m, n = grid.shape
+        if valid_positions is None:
+            valid_positions = get_valid_2x2_positions(grid)
+        flat = grid.ravel()
+        starts = np.nonzero(flat == -1)[0].tolist()
+        ends = np.nonzero(flat == -2)[0].tolist()
+        from_start = _bfs_distances(grid, starts)
+        to_end = _bfs_distances(grid, ends)
+        reached_ends = [from_start[k] for k in ends if from_start[k] != -1]
+        self.distance = min(reached_ends) if reached_ends else -1
+        dag = np.zeros(m * n, dtype=bool)
+        if self.distance != -1:
+            dag[:] = [a != -1 and b != -1 and a + b == self.distance for a, b in zip(from_start, to_end)]
+        layers = {}
+        for k in np.nonzero(dag)[0].tolist():
+            layers.setdefault(from_start[k], []).append(k)
+        self.bottlenecks = {divmod(cells[0], n) for cells in layers.values() if len(cells) == 1}
+        self.dag = dag.reshape(m, n)
+
+        evaluator = IncrementalPathEvaluator(grid)
+        touches_dag = ~window_mask(~self.dag)
+        bottleneck_mask = np.zeros((m, n), dtype=bool)
+        for cell in self.bottlenecks:
+            bottleneck_mask[cell] = True
+        touches_bottleneck = ~window_mask(~bottleneck_mask)
+        stencil, k = FrostCoverage(grid, radius).stencil, math.ceil(radius)
+        padded = np.pad(self.dag, k)
+        frost_reach = np.zeros((m - 1, n - 1), dtype=bool)
+        for a, b in zip(*np.nonzero(stencil)):
+            frost_reach |= padded[a + 1:a + m, b + 1:b + n]
+
+        self.weights = {}
+        for pos in valid_positions:
+            if touches_dag[pos]:
+                dist, _ = evaluator.min_distance([pos])
+                if dist == -1:
+                    continue
+                gain = dist - self.distance
+            else:
+                gain = 0
+            self.weights[pos] = (3 * gain + 2 * bool(touches_bottleneck[pos]) + int(touches_dag[pos])
+                                 + int(frost_reach[pos]))
+        self.usable = [pos for pos in valid_positions if pos in self.weights]
+        self.ranked = sorted((pos for pos in self.usable if self.weights[pos] > 0),
+                             key=lambda pos: (-self.weights[pos], pos))
+
+    def pool(self, size=None):
+        """The highest-ranked anchors (all with positive weight by default)."""
+        return self.ranked[:size] if size else list(self.ranked)
+
+class AnchorSampler:
+    """
+    Draws sets of non-overlapping 2x2 tiles from a fixed list of anchors.
+
+    Two anchors conflict when their windows share a cell. The anchors live in a
+    swap-remove array (the live ones are a prefix) with a slot index, so taking a tile
+    drops it and its at most 8 conflicting anchors in O(1) each, and resetting for the
+    next draw is just restoring the prefix length. Each tile is drawn from the anchors
+    still compatible with those already drawn, so every draw is scorable: uniformly,
+    or in proportion to `weights` (anchor -> positive weight) by rejection.
+    """
+
+    def __init__(self, anchors, weights=None):
+        self.anchors = list(anchors)
+        self.weights = [weights[pos] for pos in self.anchors] if weights else None
+        self.top = max(self.weights, default=0) if weights else 0
+        self.index = {pos: i for i, pos in enumerate(self.anchors)}
+        self.conflicts = [self._neighbours(pos) for pos in self.anchors]
+        self.live = list(range(len(self.anchors)))
+        self.slot = list(range(len(self.anchors)))
+
+    def _neighbours(self, pos):
+        """Indices of the anchors whose window overlaps a tile at pos (pos itself included)."""
+        r, c = pos
+        index = self.index
+        return [index[(r + dr, c + dc)] for dr in (-1, 0, 1) for dc in (-1, 0, 1) if (r + dr, c + dc) in index]
+
+    def _drop(self, i, size):
+        live, slot = self.live, self.slot
+        j = slot[i]
+        if j >= size:
+            return size
+        size -= 1
+        last = live[size]
+        live[j], live[size] = last, i
+        slot[last], slot[i] = j, size
+        return size
+
+    def sample(self, rng, count, taken=()):
+        """
+        Up to count anchors that overlap neither each other nor the tiles in taken.
+
+        Fewer are returned only when the board is jammed: no compatible anchor is left.
+        """
+        size = len(self.live)
+        for pos in taken:
+            for i in self._neighbours(pos):
+                size = self._drop(i, size)
+        chosen = []
+        live, conflicts = self.live, self.conflicts
+        weights, top = self.weights, self.top
+        while len(chosen) < count and size:
+            i = live[rng.randrange(size)]
+            if weights and rng.random() * top >= weights[i]:
+                continue  # rejection step: accepted anchors are drawn in proportion to their weight
+            chosen.append(self.anchors[i])
+            for j in conflicts[i]:
+                size = self._drop(j, size)
+        return chosen
+
+def place_tiles_optimally(grid, k_normal, l_frozen, max_attempts=2000,dbg=False,rng=None,monitor=None):
     """
     Find optimal placement of up to k normal 2x2 tiles and up to l frozen 2x2 tiles.
     Optimized version with smart pruning and adaptive strategies.
@@ -246,11 +841,18 @@ def place_tiles_optimally(grid, k_normal, l_frozen, max_attempts=2000,dbg=False)
         grid: Original grid with existing tiles and start/end positions
         k_normal: Maximum number of normal 2x2 tiles to place (filled with 1's)
         l_frozen: Maximum number of frozen 2x2 tiles to place (filled with 2's)
-        max_attempts: Maximum number of placement attempts per combination
+        max_attempts: Attempt budget scale, 7/12 of max_attempts per combination on average;
+            successive halving moves it from combinations that stop improving to the ones that do
+        rng: random.Random instance to sample with (defaults to the global random module)
+        monitor: SearchMonitor for deadlines and progress reports
     
     Returns:
         tuple: (best_grid, best_score, normal_positions, frozen_positions)
     """
+    rng = rng or random
+    monitor = monitor or SearchMonitor()
+    stats = metrics.current()
+    phase_start = perf_counter()
     valid_positions = get_valid_2x2_positions(grid)
     max_total_tiles = min(k_normal + l_frozen, len(valid_positions))
     
@@ -277,9 +879,15 @@ def place_tiles_optimally(grid, k_normal, l_frozen, max_attempts=2000,dbg=False)
         
     # Pre-compute path information for strategy optimization
     original_dist, original_path = min_distance(grid)
+    scorer = LayoutScorer(grid)
     path_nearby_positions = []
     if original_dist > 0 and original_path:
-        path_nearby_positions = get_path_nearby_2x2_positions(grid, original_path, valid_positions)
+        ranker = CandidateRanker(grid, valid_positions)
+        path_nearby_positions = ranker.pool()
+        valid_positions = ranker.usable or valid_positions
+        max_total_tiles = min(k_normal + l_frozen, len(valid_positions))
+    sampler = AnchorSampler(valid_positions)
+    nearby_sampler = AnchorSampler(path_nearby_positions, ranker.weights if path_nearby_positions else None)
     
     # Smart combination generation - prioritize higher impact combinations
     combinations_to_try = []
@@ -298,159 +906,631 @@ def place_tiles_optimally(grid, k_normal, l_frozen, max_attempts=2000,dbg=False)
     
     if dbg:print(f"Testing {len(combinations_to_try)} combinations in smart order...")
     
-    # Adaptive attempt allocation based on combination complexity
+    # Successive halving over the combinations: every round splits an equal share of the
+    # budget among the surviving arms, then keeps the better-scoring half minus the arms
+    # that went `patience` rounds without improving. The leader stays while it has rivals;
+    # once alone it runs on only while it keeps improving.
     total_combinations = len(combinations_to_try)
-    early_termination_threshold = baseline_score * 1.5  # Stop if we find a very good solution early
-    
-    for combo_idx, (num_normal, num_frozen) in enumerate(combinations_to_try):
+    exceptional_score = baseline_score * 1.8  # Stop everything once a solution is this good
+    budget = max_attempts * total_combinations * 7 // 12
+    round_budget = max(1, budget // (math.ceil(math.log2(max(total_combinations, 1))) + 1))
+    arms = {combo: {"best": float('-inf'), "normal": [], "frozen": [], "stale": 0}
+            for combo in combinations_to_try}
+    survivors = list(combinations_to_try)
+    spent = 0
+    patience = 2  # rounds without improvement before an arm is dropped
+    stats.phases['setup'] += perf_counter() - phase_start
+
+    def pull(num_normal, num_frozen, attempts):
+        """Spend attempts on one combination; True when its best score improved."""
+        arm = arms[(num_normal, num_frozen)]
+        start_score = arm["best"]
         total_tiles = num_normal + num_frozen
-        
-        # Adaptive attempt count - more attempts for promising combinations
-        if combo_idx < total_combinations // 3:  # First third gets more attempts
-            combo_attempts = max_attempts
-        elif combo_idx < 2 * total_combinations // 3:  # Middle third gets moderate attempts
-            combo_attempts = max_attempts // 2
-        else:  # Last third gets fewer attempts
-            combo_attempts = max_attempts // 4
-        
-        if dbg:print(f"Combination {combo_idx + 1}/{total_combinations}: {num_normal}N + {num_frozen}F ({combo_attempts} attempts)")
-        
-        combo_best_score = float('-inf')
-        combo_best_grid = None
-        combo_best_normal_pos = []
-        combo_best_frozen_pos = []
-        
-        # Choose strategy based on availability of path information and tile count
+        # Path-aware placement gets most attempts when the path area can hold the tiles
         use_path_strategy = len(path_nearby_positions) >= total_tiles and total_tiles > 1
-        
-        if use_path_strategy:
-            # Prioritize path-aware placement for larger tile counts
-            path_attempts = int(combo_attempts * 0.7)
-            random_attempts = combo_attempts - path_attempts
-        else:
-            # Use mostly random placement
-            path_attempts = int(combo_attempts * 0.3)
-            random_attempts = combo_attempts - path_attempts
-        
-        # Strategy 1: Path-aware placement (if applicable)
-        if use_path_strategy and path_attempts > 0:
-            for attempt in range(path_attempts):
-                success = False
-                for retry in range(5):  # Reduced retries for efficiency
-                    # Smart position selection
-                    if len(path_nearby_positions) >= total_tiles:
-                        selected_positions = random.sample(path_nearby_positions, total_tiles)
-                    else:
-                        nearby_count = len(path_nearby_positions)
-                        selected_positions = path_nearby_positions[:]
-                        remaining_positions = [p for p in valid_positions if p not in path_nearby_positions]
-                        if len(remaining_positions) >= total_tiles - nearby_count:
-                            selected_positions.extend(random.sample(remaining_positions, total_tiles - nearby_count))
-                        else:
-                            break
-                    
-                    if not check_positions_overlap(selected_positions):
-                        normal_positions = selected_positions[:num_normal]
-                        frozen_positions = selected_positions[num_normal:]
-                        
-                        test_grid = copy.deepcopy(grid)
-                        
-                        # Place tiles
-                        for pos in normal_positions:
-                            test_grid = place_2x2_tile(test_grid, pos[0], pos[1], 3)
-                        for pos in frozen_positions:
-                            test_grid = place_2x2_tile(test_grid, pos[0], pos[1], 4)
-                        
-                        current_score = score(test_grid)
-                        if current_score != -1 and current_score > combo_best_score:
-                            combo_best_score = current_score
-                            combo_best_grid = copy.deepcopy(test_grid)
-                            combo_best_normal_pos = normal_positions
-                            combo_best_frozen_pos = frozen_positions
-                        
-                        success = True
-                        break
-                
-                # Early termination if we found an excellent solution
-                if combo_best_score > early_termination_threshold:
-                    print(f"Early termination: Excellent solution found (score: {combo_best_score})")
-                    break
-        
-        # Strategy 2: Random placement
-        for attempt in range(random_attempts):
-            success = False
-            for retry in range(5):  # Reduced retries
-                selected_positions = random.sample(valid_positions, total_tiles)
-                
-                if not check_positions_overlap(selected_positions):
-                    normal_positions = selected_positions[:num_normal]
-                    frozen_positions = selected_positions[num_normal:]
-                    
-                    test_grid = copy.deepcopy(grid)
-                    
-                    # Place tiles
-                    for pos in normal_positions:
-                        test_grid = place_2x2_tile(test_grid, pos[0], pos[1], 3)
-                    for pos in frozen_positions:
-                        test_grid = place_2x2_tile(test_grid, pos[0], pos[1], 4)
-                    
-                    current_score = score(test_grid)
-                    if current_score != -1 and current_score > combo_best_score:
-                        combo_best_score = current_score
-                        combo_best_grid = copy.deepcopy(test_grid)
-                        combo_best_normal_pos = normal_positions
-                        combo_best_frozen_pos = frozen_positions
-                    
-                    success = True
-                    break
-            
-            # Early termination check
-            if combo_best_score > early_termination_threshold:
+        path_attempts = int(attempts * (0.7 if use_path_strategy else 0))
+        for attempt in range(attempts):
+            if monitor.expired():
                 break
-        
-        # Update global best
-        if combo_best_score > best_score:
-            best_score = combo_best_score
-            best_grid = combo_best_grid
-            best_normal_pos = combo_best_normal_pos
-            best_frozen_pos = combo_best_frozen_pos
-            best_combination = (num_normal, num_frozen)
-            print(f"New best: {num_normal}N + {num_frozen}F, score: {best_score}")
-            
+            phase = 'path_sampling' if attempt < path_attempts else 'random_sampling'
+            phase_start = perf_counter()
+            if attempt < path_attempts:
+                # Smart position selection, topped up from all anchors if the path area jams
+                selected_positions = nearby_sampler.sample(rng, total_tiles)
+                if len(selected_positions) < total_tiles:
+                    selected_positions += sampler.sample(rng, total_tiles - len(selected_positions),
+                                                         taken=selected_positions)
+            else:
+                selected_positions = sampler.sample(rng, total_tiles)
+            if len(selected_positions) < total_tiles:
+                stats.inc('sampler_jams')
+            else:
+                normal_positions = selected_positions[:num_normal]
+                frozen_positions = selected_positions[num_normal:]
+                current_score = scorer.score(normal_positions, frozen_positions)
+                if current_score != -1 and current_score > arm["best"]:
+                    arm.update(best=current_score, normal=normal_positions, frozen=frozen_positions)
+                    monitor.improved(current_score, normal_positions, frozen_positions)
+            stats.phases[phase] += perf_counter() - phase_start
+            if arm["best"] > exceptional_score:
+                break
+        return arm["best"] > start_score
+
+    while survivors and spent < budget and not monitor.expired():
+        share = max(1, min(round_budget, budget - spent) // len(survivors))
+        if dbg:print(f"Round: {len(survivors)} combinations, {share} attempts each")
+        for combo in survivors:
+            arms[combo]["stale"] = 0 if pull(*combo, share) else arms[combo]["stale"] + 1
+        spent += share * len(survivors)
+        ranked = sorted(survivors, key=lambda combo: -arms[combo]["best"])
+        leader = ranked[0]
+        if arms[leader]["best"] > best_score:
+            best_score = arms[leader]["best"]
+            best_normal_pos, best_frozen_pos = arms[leader]["normal"], arms[leader]["frozen"]
+            best_combination = leader
+            print(f"New best: {leader[0]}N + {leader[1]}F, score: {best_score}")
             # Early global termination for exceptional solutions
-            if best_score > early_termination_threshold * 1.2:
+            if best_score > exceptional_score:
                 print(f"Exceptional solution found, terminating search early!")
+                stats.inc('early_terminations')
                 break
-        
-        # Adaptive pruning - if recent combinations aren't improving, reduce search
-        if combo_idx > 5 and combo_best_score < best_score * 0.8:
-            print(f"Pruning: Recent combinations underperforming, skipping some...")
-            # Skip every other combination in the remaining set
-            if combo_idx % 2 == 0:
-                continue
+        keep = ranked[:math.ceil(len(ranked) / 2)]
+        survivors = [combo for combo in keep
+                     if arms[combo]["stale"] < patience or combo == keep[0] and len(keep) > 1]
+        if dbg and len(survivors) < len(ranked):print(f"Dropped {len(ranked) - len(survivors)} combinations")
+    if monitor.expired():
+        print("Deadline reached, returning best solution so far")
+    if best_score != float('-inf'):
+        best_grid = scorer.grid_with(best_normal_pos, best_frozen_pos)
     
     print(f"Final best combination: {best_combination[0]} normal + {best_combination[1]} frozen tiles")
     print(f"Best score achieved: {best_score} (improvement: {best_score - baseline_score})")
     
     return best_grid, best_score, best_normal_pos, best_frozen_pos
 
-def get_path_nearby_2x2_positions(grid, path, valid_positions):
-    """Get 2x2 positions that are near the path."""
-    nearby_positions = []
-    
-    for pos in valid_positions:
-        top_row, left_col = pos
-        tile_center = (top_row + 0.5, left_col + 0.5)
-        
-        # Check if tile is close to any point on the path
-        min_distance_to_path = min(l2norm(tile_center, path_point) for path_point in path)
-        
-        if min_distance_to_path <= 4:  # Adjust threshold as needed
-            nearby_positions.append(pos)
-    
-    return nearby_positions
+def _placement_worker(args):
+    grid, k_normal, l_frozen, max_attempts, seed, deadline_ms = args
+    with metrics.collect() as stats:
+        result = place_tiles_optimally(grid, k_normal, l_frozen, max_attempts, rng=random.Random(seed),
+                                       monitor=SearchMonitor(deadline_ms))
+    return result, stats
+
+def parallel_tile_placement(grid, k_normal, l_frozen, max_attempts=10000, workers=None, seed=None, monitor=None):
+    """
+    Run place_tiles_optimally in a pool of worker processes and keep the global best.
+
+    Each worker gets an equal share of max_attempts and its own seed derived from
+    `seed`, so results are reproducible for a fixed (seed, workers) pair. The monitor's
+    deadline is forwarded to the workers; progress is only reported for the final best.
+
+    Returns:
+        tuple: (best_grid, best_score, normal_positions, frozen_positions)
+    """
+    workers = max(1, min(workers or os.cpu_count() or 1, max_attempts))
+    worker_seeds = [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(seed).spawn(workers)]
+    shares = [max_attempts // workers + (i < max_attempts % workers) for i in range(workers)]
+    monitor = monitor or SearchMonitor()
+    deadline_ms = max(1, (monitor.deadline - perf_counter()) * 1000) if monitor.deadline else None
+    jobs = [(grid, k_normal, l_frozen, share, s, deadline_ms) for share, s in zip(shares, worker_seeds)]
+    if workers == 1:
+        results = [_placement_worker(jobs[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_placement_worker, jobs))
+    # Worker phases add up CPU time across processes rather than wall time
+    for _, stats in results:
+        metrics.current().merge(stats)
+    results = [result for result, _ in results]
+    # Ties go to the lowest worker index so the reduction is deterministic
+    best = max(results, key=lambda res: res[1])
+    if best[0] is not None:
+        monitor.improved(best[1], best[2], best[3])
+    monitor.expired()
+    return best
+
+def tile_cells(pos):
+    """The four cells covered by a 2x2 tile with top-left corner pos."""
+    r, c = pos
+    return ((r, c), (r, c + 1), (r + 1, c), (r + 1, c + 1))
+
+def _fill_layout(rng, pool, tiles, k_normal, l_frozen, occupied=None):
+    """
+    Add randomly chosen non-overlapping tiles from pool to tiles (a list of (pos, type))
+    until k_normal normal and l_frozen frozen tiles are used or the pool runs out.
+    """
+    occupied = occupied if occupied is not None else {cell for pos, _ in tiles for cell in tile_cells(pos)}
+    counts = {3: sum(t == 3 for _, t in tiles), 4: sum(t == 4 for _, t in tiles)}
+    wanted = [3] * (k_normal - counts[3]) + [4] * (l_frozen - counts[4])
+    if not wanted:
+        return tiles
+    rng.shuffle(wanted)
+    for pos in rng.sample(pool, len(pool)):
+        if not wanted:
+            break
+        cells = tile_cells(pos)
+        if not occupied.intersection(cells):
+            occupied.update(cells)
+            tiles.append((pos, wanted.pop()))
+    return tiles
+
+def _split_layout(tiles):
+    return [p for p, t in tiles if t == 3], [p for p, t in tiles if t == 4]
+
+def seed_layout(grid, seeds, k_normal, l_frozen):
+    """
+    Best warm-start layout among seeds, each a (normal_positions, frozen_positions) pair.
+
+    Tiles that do not fit the board, overlap an earlier tile of the same seed or exceed
+    the tile budget are dropped, so a layout from a similar board still gives a start.
+
+    Returns:
+        tuple: (tiles as (pos, type) pairs, score), or ([], None) when no seed scores
+    """
+    valid_set = set(get_valid_2x2_positions(grid))
+    scorer = LayoutScorer(grid)
+    best_tiles, best_score = [], None
+    for normal_positions, frozen_positions in seeds:
+        tiles, occupied = [], set()
+        limits = {3: k_normal, 4: l_frozen}
+        for pos, t in [(p, 3) for p in normal_positions] + [(p, 4) for p in frozen_positions]:
+            pos = (int(pos[0]), int(pos[1]))
+            cells = tile_cells(pos)
+            if pos in valid_set and limits[t] > 0 and not occupied.intersection(cells):
+                occupied.update(cells)
+                limits[t] -= 1
+                tiles.append((pos, t))
+        if not tiles:
+            continue
+        current = scorer.score(*_split_layout(tiles))
+        if current != -1 and (best_score is None or current > best_score):
+            best_tiles, best_score = tiles, current
+    return best_tiles, best_score
+
+def genetic_tile_placement(grid, k_normal, l_frozen, population_size=100, generations=200,
+                           mutation_rate=0.1, crossover_rate=0.8, seed=None, dbg=False, monitor=None,
+                           initial=None):
+    """
+    Genetic search over layouts of up to k_normal normal and l_frozen frozen 2x2 tiles.
+
+    A genome is a list of non-overlapping (position, tile_type) pairs. Each generation
+    keeps the two best genomes, breeds the rest with tournament selection, union
+    crossover and move/retype/resample mutations, and scores the whole population
+    in one batch (duplicate genomes are scored once).
+
+    Returns:
+        tuple: (best_grid, best_score, normal_positions, frozen_positions)
+    """
+    rng = random.Random(seed)
+    monitor = monitor or SearchMonitor()
+    valid_positions = get_valid_2x2_positions(grid)
+    if score(grid) == -1:
+        print("Grid has no valid path!")
+        return None, float('-inf'), [], []
+    if len(valid_positions) == 0:
+        print("No valid positions for tile placement!")
+        return grid, score(grid), [], []
+    scorer = LayoutScorer(grid)
+    ranker = CandidateRanker(grid, valid_positions)
+    valid_positions = ranker.usable or valid_positions
+    valid_set = set(valid_positions)
+    nearby = ranker.pool() or valid_positions
+
+    def fitness(population):
+        scores = scorer.score_batch([_split_layout(g) for g in population])
+        return [sc if sc != -1 else float('-inf') for sc in scores]
+
+    def tournament(population, scores):
+        picks = rng.sample(range(len(population)), min(3, len(population)))
+        return population[max(picks, key=lambda i: scores[i])]
+
+    def crossover(a, b):
+        # Union of both parents' tiles in random order, keeping whatever still fits
+        child, occupied = [], set()
+        counts = {3: 0, 4: 0}
+        limits = {3: k_normal, 4: l_frozen}
+        for pos, t in rng.sample(a + b, len(a) + len(b)):
+            cells = tile_cells(pos)
+            if counts[t] < limits[t] and not occupied.intersection(cells):
+                occupied.update(cells)
+                counts[t] += 1
+                child.append((pos, t))
+        return child
+
+    def mutate(genome):
+        child = []
+        for pos, t in genome:
+            if rng.random() >= mutation_rate:
+                child.append((pos, t))
+                continue
+            move = rng.random()
+            if move < 0.5:
+                # Nudge the tile by one or two cells
+                nudged = (pos[0] + rng.randint(-2, 2), pos[1] + rng.randint(-2, 2))
+                child.append((nudged if nudged in valid_set else pos, t))
+            elif move < 0.7:
+                child.append((pos, 7 - t))  # swap normal <-> frozen, rebalanced below
+            # otherwise drop it and let _fill_layout resample a replacement
+        occupied, kept = set(), []
+        counts = {3: 0, 4: 0}
+        limits = {3: k_normal, 4: l_frozen}
+        for pos, t in child:
+            cells = tile_cells(pos)
+            if counts[t] < limits[t] and not occupied.intersection(cells):
+                occupied.update(cells)
+                counts[t] += 1
+                kept.append((pos, t))
+        return _fill_layout(rng, nearby if rng.random() < 0.7 else valid_positions,
+                            kept, k_normal, l_frozen, occupied)
+
+    population = [_fill_layout(rng, nearby if i % 2 == 0 else valid_positions, [], k_normal, l_frozen)
+                  for i in range(population_size)]
+    if initial:
+        # Warm start: the seed as given and topped up to the full tile budget
+        population[0] = list(initial)
+        population[1 % population_size] = _fill_layout(rng, nearby, list(initial), k_normal, l_frozen)
+    scores = fitness(population)
+    best_idx = max(range(len(population)), key=lambda i: scores[i])
+    best_genome, best_score = population[best_idx], scores[best_idx]
+    if best_score != float('-inf'):
+        monitor.improved(best_score, *_split_layout(best_genome))
+    for gen in range(generations):
+        if monitor.expired():
+            print(f"Deadline reached after {gen} generations")
+            break
+        order = sorted(range(len(population)), key=lambda i: -scores[i])
+        offspring = [population[i] for i in order[:2]]
+        while len(offspring) < population_size:
+            a, b = tournament(population, scores), tournament(population, scores)
+            child = crossover(a, b) if rng.random() < crossover_rate else list(a)
+            offspring.append(mutate(child))
+        population = offspring
+        scores = fitness(population)
+        gen_best = max(range(len(population)), key=lambda i: scores[i])
+        if scores[gen_best] > best_score:
+            best_genome, best_score = population[gen_best], scores[gen_best]
+            print(f"New best: generation {gen + 1}, score: {best_score}")
+            monitor.improved(best_score, *_split_layout(best_genome))
+    if dbg:
+        print(f"Genetic search scored {scorer.evaluations} distinct layouts")
+    if best_score == float('-inf'):
+        return None, best_score, [], []
+    normal_pos, frozen_pos = _split_layout(best_genome)
+    return scorer.grid_with(normal_pos, frozen_pos), best_score, normal_pos, frozen_pos
 
-def find_optimal_tile_placement(grid, k_normal, l_frozen, max_attempts=10000,dbg=False):
+def annealing_tile_placement(grid, k_normal, l_frozen, initial_temp=1000, cooling_rate=0.95, min_temp=0.01,
+                             max_iterations=10000, time_limit=None, seed=None, dbg=False, monitor=None,
+                             initial=None):
+    """
+    Simulated annealing over a single layout of up to k_normal normal and l_frozen frozen tiles.
+
+    Each move touches one tile: nudge it to a neighbouring anchor, jump it to a random
+    anchor, retype it, or swap types with a tile of the other kind. Overlap checks
+    only look at the moved tile's four cells via a cell -> tile occupancy map.
+    The temperature is multiplied by cooling_rate after every block of moves sized so
+    max_iterations spans the whole schedule; the search stops at min_temp, after
+    max_iterations moves, or once time_limit seconds have elapsed.
+
+    Returns:
+        tuple: (best_grid, best_score, normal_positions, frozen_positions)
+    """
+    rng = random.Random(seed)
+    monitor = monitor or SearchMonitor()
+    deadline = perf_counter() + time_limit if time_limit else None
+    valid_positions = get_valid_2x2_positions(grid)
+    if score(grid) == -1:
+        print("Grid has no valid path!")
+        return None, float('-inf'), [], []
+    if len(valid_positions) == 0:
+        print("No valid positions for tile placement!")
+        return grid, score(grid), [], []
+    scorer = LayoutScorer(grid)
+    ranker = CandidateRanker(grid, valid_positions)
+    valid_positions = ranker.usable or valid_positions
+    valid_set = set(valid_positions)
+    nearby = ranker.pool() or valid_positions
+
+    # A warm start keeps the seed's tiles and only tops up the unused budget
+    tiles = _fill_layout(rng, nearby, list(initial or []), k_normal, l_frozen)
+    owner = {cell: i for i, (pos, _) in enumerate(tiles) for cell in tile_cells(pos)}
+    limits = {3: k_normal, 4: l_frozen}
+    counts = {3: sum(t == 3 for _, t in tiles), 4: sum(t == 4 for _, t in tiles)}
+    if not tiles:
+        return grid, score(grid), [], []
+
+    def fits(i, pos):
+        return pos in valid_set and all(owner.get(cell, i) == i for cell in tile_cells(pos))
+
+    def move_tile(i, pos):
+        old = tiles[i][0]
+        for cell in tile_cells(old):
+            del owner[cell]
+        for cell in tile_cells(pos):
+            owner[cell] = i
+        tiles[i] = (pos, tiles[i][1])
+
+    def retype(i, t):
+        counts[tiles[i][1]] -= 1
+        counts[t] += 1
+        tiles[i] = (tiles[i][0], t)
+
+    def swap_types(i, j):
+        (pi, ti), (pj, tj) = tiles[i], tiles[j]
+        tiles[i], tiles[j] = (pi, tj), (pj, ti)
+
+    current = scorer.score(*_split_layout(tiles))
+    current = current if current != -1 else float('-inf')
+    best_score, best_tiles = current, list(tiles)
+    levels = max(1, math.ceil(math.log(min_temp / initial_temp) / math.log(cooling_rate)))
+    moves_per_level = max(1, max_iterations // levels)
+    temp = initial_temp
+    iteration = 0
+    while temp > min_temp and iteration < max_iterations:
+        if (deadline and perf_counter() > deadline) or monitor.expired():
+            if dbg:print("Annealing stopped at the time limit")
+            break
+        for _ in range(moves_per_level):
+            iteration += 1
+            i = rng.randrange(len(tiles))
+            pos, t = tiles[i]
+            kind = rng.random()
+            if kind < 0.5:
+                target = (pos[0] + rng.randint(-1, 1), pos[1] + rng.randint(-1, 1))
+            elif kind < 0.7:
+                target = rng.choice(nearby if rng.random() < 0.7 else valid_positions)
+            else:
+                target = None
+            if target is not None:
+                if target == pos or not fits(i, target):
+                    continue
+                move_tile(i, target)
+                undo = lambda: move_tile(i, pos)
+            elif kind < 0.85:
+                if counts[7 - t] >= limits[7 - t]:
+                    continue
+                retype(i, 7 - t)
+                undo = lambda: retype(i, t)
+            else:
+                others = [j for j, (_, u) in enumerate(tiles) if u != t]
+                if not others:
+                    continue
+                j = rng.choice(others)
+                swap_types(i, j)
+                undo = lambda: swap_types(i, j)
+            candidate = scorer.score(*_split_layout(tiles))
+            candidate = candidate if candidate != -1 else float('-inf')
+            delta = candidate - current
+            if delta >= 0 or (candidate != float('-inf') and rng.random() < math.exp(delta / temp)):
+                current = candidate
+                if current > best_score:
+                    best_score, best_tiles = current, list(tiles)
+                    print(f"New best: iteration {iteration}, score: {best_score}")
+                    monitor.improved(best_score, *_split_layout(best_tiles))
+            else:
+                undo()
+            if iteration >= max_iterations:
+                break
+        temp *= cooling_rate
+    if best_score == float('-inf'):
+        return None, best_score, [], []
+    normal_pos, frozen_pos = _split_layout(best_tiles)
+    return scorer.grid_with(normal_pos, frozen_pos), best_score, normal_pos, frozen_pos
+
+def greedy_tile_placement(grid, k_normal, l_frozen, greediness=0.8, max_iterations=5000, dbg=False, monitor=None,
+                          initial=None):
+    """
+    Deterministic greedy / beam search that adds one tile at a time.
+
+    Every step tries each legal anchor that touches the current shortest path (any
+    type) or, for frozen tiles, brings a frost center within range of it, and keeps
+    the best partial layouts. greediness=1.0 is a pure greedy search; lower values
+    widen the beam (up to 10 layouts at 0.1). max_iterations caps score evaluations.
+
+    Returns:
+        tuple: (best_grid, best_score, normal_positions, frozen_positions)
+    """
+    base_score = score(grid)
+    if base_score == -1:
+        print("Grid has no valid path!")
+        return None, float('-inf'), [], []
+    monitor = monitor or SearchMonitor()
+    beam_width = max(1, round((1 - greediness) * 10) + 1)
+    base = LayoutScorer(grid)
+    stencil = base.coverage.stencil
+    k = base.coverage.k
+    beam = [(base_score, [])]
+    best_score, best_tiles = base_score, []
+    if initial:
+        # Warm start: grow the seed alongside the empty layout
+        seed_score = base.score(*_split_layout(initial))
+        if seed_score != -1:
+            beam.append((seed_score, list(initial)))
+            if seed_score > best_score:
+                best_score, best_tiles = seed_score, list(initial)
+    evaluations = 0
+    for step in range(k_normal + l_frozen):
+        children = {}
+        for current_score, tiles in beam:
+            normal_pos, frozen_pos = _split_layout(tiles)
+            scorer = LayoutScorer(base.grid_with(normal_pos, frozen_pos))
+            free = scorer.scratch.free_mask()
+            on_path = np.zeros(scorer.scratch.shape, dtype=bool)
+            for cell in scorer.evaluator.path_cells:
+                on_path[cell] = True
+            touches_path = free & ~window_mask(~on_path)
+            # Frost reach: windows whose frost stencil overlaps a path cell
+            padded = np.pad(on_path, k)
+            n, m = free.shape
+            reach = np.zeros_like(free)
+            for a, b in zip(*np.nonzero(stencil)):
+                reach |= padded[a + 1:a + 1 + n, b + 1:b + 1 + m]
+            types = [t for t, used, limit in ((3, len(normal_pos), k_normal), (4, len(frozen_pos), l_frozen))
+                     if used < limit]
+            for t in types:
+                mask = touches_path if t == 3 else free & (touches_path | reach)
+                for pos in zip(*(idx.tolist() for idx in np.nonzero(mask))):
+                    key = frozenset(tiles + [(pos, t)])
+                    if key in children:
+                        continue
+                    s = scorer.score([pos], []) if t == 3 else scorer.score([], [pos])
+                    evaluations += 1
+                    if s != -1:
+                        children[key] = (s, tiles + [(pos, t)])
+        if not children:
+            break
+        beam = sorted(children.values(), key=lambda child: (-child[0], sorted(child[1])))[:beam_width]
+        if beam[0][0] > best_score:
+            best_score, best_tiles = beam[0]
+            print(f"New best: {step + 1} tiles, score: {best_score}")
+            monitor.improved(best_score, *_split_layout(best_tiles))
+        if monitor.expired():
+            break
+        if evaluations >= max_iterations:
+            if dbg:print(f"Greedy search stopped after {evaluations} evaluations")
+            break
+    normal_pos, frozen_pos = _split_layout(best_tiles)
+    return base.grid_with(normal_pos, frozen_pos), best_score, normal_pos, frozen_pos
+
+def score_upper_bound(max_dist, max_covered, d=5, t=1, c=2):
+    """
+    Admissible upper bound on score() for any path of at most max_dist steps that
+    passes at most max_covered frost-covered cells (assumes c >= 1).
+
+    Every point scores t*c while the frost counter is positive and otherwise its step
+    length; frozen points number at most d*(1 + covered) and each one after the
+    first consumes at least one step.
+    """
+    points = max_dist + 1
+    frozen_points = min(points, d * (1 + max_covered))
+    return t * points + (t * c - t) * frozen_points
+
+def branch_and_bound_tile_placement(grid, k_normal, l_frozen, max_nodes=10000, time_limit=None, dbg=False,
+                                    monitor=None, initial=None):
+    """
+    Exact depth-first branch and bound over layouts of up to k_normal normal and
+    l_frozen frozen tiles.
+
+    Layouts are enumerated once each (anchors in a fixed order, interchangeable
+    tiles of the same type never permuted) and seeded with the greedy solution.
+    A subtree is pruned when score_upper_bound cannot beat the incumbent: the path is
+    capped by the colour balance and 2x2 windows of the start's reachable region, and
+    frost can only reach cells already covered or within range of the remaining frost
+    tiles. A layout is scored in full only when its exact distance (a bitset BFS) could
+    still beat the incumbent. Normal tiles outside the reachable region and frost tiles
+    out of its range are never tried.
+
+    Returns:
+        tuple: (best_grid, best_score, normal_positions, frozen_positions, proven_optimal)
+    """
+    base_score = score(grid)
+    if base_score == -1:
+        print("Grid has no valid path!")
+        return None, float('-inf'), [], [], False
+    monitor = monitor or SearchMonitor()
+    deadline = perf_counter() + time_limit if time_limit else None
+    greedy = greedy_tile_placement(grid, k_normal, l_frozen, monitor=monitor, initial=initial)
+    best_score, best_tiles = greedy[1], [(p, 3) for p in greedy[2]] + [(p, 4) for p in greedy[3]]
+    scorer = LayoutScorer(grid)
+    coverage = FrostCoverage(grid)
+    stencil, k = coverage.stencil, coverage.k
+    # Cells a new frost tile can ever cover: its own window plus the 8 overlapping ones
+    tile_reach = np.zeros((stencil.shape[0] + 2, stencil.shape[1] + 2), dtype=bool)
+    for i in range(3):
+        for j in range(3):
+            tile_reach[i:i + stencil.shape[0], j:j + stencil.shape[1]] |= stencil.astype(bool)
+    per_tile_cover = int(tile_reach.sum())
+
+    region = reachable_mask(grid)
+    padded = np.pad(region, k + 1)
+    n, m = grid.shape[0] - 1, grid.shape[1] - 1
+    frost_reach = np.zeros((n, m), dtype=bool)
+    for a, b in zip(*np.nonzero(tile_reach)):
+        frost_reach |= padded[a + 1:a + 1 + n, b + 1:b + 1 + m]
+    region_windows = ~window_mask(~region)
+    # A tile that alone cuts the maze makes every superset invalid too
+    ranker = CandidateRanker(grid)
+    anchors = [pos for pos in ranker.usable if region_windows[pos] or frost_reach[pos]]
+    # Highest-ranked anchors first so good layouts (and tighter incumbents) come early
+    anchors.sort(key=lambda pos: -ranker.weights[pos])
+
+    # Nodes carry bitsets: the layout, its reachable region and its frost-covered cells.
+    # A child keeps its parent's region unless the new tile lands in it, and frost
+    # cover is the union of the static cover and each frost tile's own footprint.
+    from bitboard import Bitboard
+    root = Bitboard(grid)
+    stride = root.stride
+    rows, cols = np.indices(grid.shape)
+    dark = root.mask((rows + cols) % 2 == 0)
+    corners = [root.mask((rows % 2 == a) & (cols % 2 == b)) for a in (0, 1) for b in (0, 1)]
+    frosted = root.mask(coverage.count > 0)
+    footprint = {}
+    for pos in anchors if l_frozen else ():
+        coverage.add([pos])
+        footprint[pos] = root.mask(coverage.count > 0)
+        coverage.remove([pos])
+
+    def bound(reach, frosted, frozen_left):
+        # A shortest path alternates cell colours and, having no shortcuts, never holds
+        # all four cells of a 2x2 window: one cell of every full window in a disjoint tiling is off it
+        cells = reach.bit_count()
+        dark_cells = (reach & dark).bit_count()
+        full = reach & reach >> 1 & reach >> stride & reach >> (stride + 1)
+        max_dist = min(cells - 1 - max((full & corner).bit_count() for corner in corners),
+                       2 * min(dark_cells, cells - dark_cells))
+        covered = (frosted & reach).bit_count() + frozen_left * per_tile_cover
+        return score_upper_bound(max_dist, min(covered, max_dist + 1))
+
+    nodes = 0
+    exhausted = False
+    tiles = []
+
+    def search(start, normal_left, frozen_left, board, reach, frosted):
+        nonlocal nodes, best_score, best_tiles, exhausted
+        nodes += 1
+        if nodes > max_nodes or (deadline and perf_counter() > deadline) or monitor.expired():
+            exhausted = True
+            return
+        if tiles:
+            # The layout's exact distance is one bit-parallel BFS; only a layout whose
+            # distance could still beat the incumbent is scored in full
+            dist = board.distance()
+            if dist == -1:
+                return  # no path, and more tiles cannot open one
+            if score_upper_bound(dist, min((frosted & reach).bit_count(), dist + 1)) > best_score:
+                current = scorer.score(*_split_layout(tiles))
+                if current > best_score:
+                    best_score, best_tiles = current, list(tiles)
+                    print(f"New best: {len(tiles)} tiles, score: {best_score}")
+                    monitor.improved(best_score, *_split_layout(best_tiles))
+        if normal_left + frozen_left == 0 or bound(reach, frosted, frozen_left) <= best_score:
+            return
+        for idx in range(start, len(anchors)):
+            pos = anchors[idx]
+            if not board.fits(*pos):
+                continue
+            child = board.block([pos])
+            # Completed layouts are checked against their own distance, so they keep the parent's region
+            child_reach = reach
+            if normal_left + frozen_left > 1 and board.passable & reach != child.passable & reach:
+                child_reach = child.reachable()
+            for t, left in ((3, normal_left), (4, frozen_left)):
+                if not left or (t == 3 and not region_windows[pos]):
+                    continue
+                tiles.append((pos, t))
+                search(idx + 1, normal_left - (t == 3), frozen_left - (t == 4), child, child_reach,
+                       frosted | footprint[pos] if t == 4 else frosted)
+                tiles.pop()
+                if exhausted:
+                    return
+
+    search(0, k_normal, l_frozen, root, root.reachable(), frosted)
+    proven = not exhausted
+    if dbg:
+        print(f"Branch and bound visited {nodes} nodes, optimality {'proven' if proven else 'not proven'}")
+    normal_pos, frozen_pos = _split_layout(best_tiles)
+    return scorer.grid_with(normal_pos, frozen_pos), best_score, normal_pos, frozen_pos, proven
+
+def find_optimal_tile_placement(grid, k_normal, l_frozen, max_attempts=10000,dbg=False,workers=1,seed=None,
+                                algorithm='random',monitor=None,seeds=None,**params):
     """
     Main function to find optimal 2x2 tile placement.
     
@@ -459,6 +1539,13 @@ def find_optimal_tile_placement(grid, k_normal, l_frozen, max_attempts=10000,dbg
         k_normal: Number of normal 2x2 tiles (newly added marked as 3)
         l_frozen: Number of frozen 2x2 tiles (newly added marked as 4)
         max_attempts: Maximum optimization attempts
+        workers: Number of search processes; above 1 the attempts are split across a process pool
+        seed: Base seed for the search's random generators (parallel, genetic and simulated modes)
+        algorithm: 'random' (sampling search), 'exact', 'greedy', 'genetic' or 'simulated'
+        monitor: Optional SearchMonitor (deadline_ms and progress callback) for anytime solving
+        seeds: Optional warm-start layouts as (normal_positions, frozen_positions) pairs; the
+            search starts from the best one and the sampling search becomes a local search around it
+        params: Extra keyword arguments for the chosen algorithm
     
     Returns:
         Dictionary with results
@@ -468,14 +1555,56 @@ def find_optimal_tile_placement(grid, k_normal, l_frozen, max_attempts=10000,dbg
         _,path=min_distance(grid)
         visualize_grid(grid,path)
     
-    original_score = score(grid)
+    stats = metrics.current()
+    with stats.phase('original_score'):
+        original_score = score(grid)
     if dbg:
         print(f"Original score: {original_score}")
         print(f"\nSearching for optimal placement of {k_normal} normal tiles and {l_frozen} frozen tiles...")
         
-    best_grid, best_score, normal_pos, frozen_pos = place_tiles_optimally(
-        grid, k_normal, l_frozen, max_attempts,dbg
-    )
+    monitor = monitor or SearchMonitor()
+    proven_optimal = None
+    start_tiles, start_score = seed_layout(grid, seeds, k_normal, l_frozen) if seeds else ([], None)
+    if start_tiles:
+        if dbg:print(f"Warm start from a seed scoring {start_score}")
+        monitor.improved(start_score, *_split_layout(start_tiles))
+        params['initial'] = start_tiles
+    search_start = perf_counter()
+    if algorithm == 'exact':
+        best_grid, best_score, normal_pos, frozen_pos, proven_optimal = branch_and_bound_tile_placement(
+            grid, k_normal, l_frozen, dbg=dbg, monitor=monitor, **params
+        )
+    elif algorithm == 'genetic':
+        best_grid, best_score, normal_pos, frozen_pos = genetic_tile_placement(
+            grid, k_normal, l_frozen, seed=seed, dbg=dbg, monitor=monitor, **params
+        )
+    elif algorithm == 'greedy':
+        best_grid, best_score, normal_pos, frozen_pos = greedy_tile_placement(
+            grid, k_normal, l_frozen, dbg=dbg, monitor=monitor, **params
+        )
+    elif algorithm == 'simulated':
+        best_grid, best_score, normal_pos, frozen_pos = annealing_tile_placement(
+            grid, k_normal, l_frozen, seed=seed, dbg=dbg, monitor=monitor, **params
+        )
+    elif start_tiles:
+        # Local search around the seed: low-temperature annealing on the sampling budget
+        best_grid, best_score, normal_pos, frozen_pos = annealing_tile_placement(
+            grid, k_normal, l_frozen, initial_temp=10, max_iterations=max_attempts, seed=seed, dbg=dbg,
+            monitor=monitor, initial=start_tiles
+        )
+    elif workers > 1:
+        best_grid, best_score, normal_pos, frozen_pos = parallel_tile_placement(
+            grid, k_normal, l_frozen, max_attempts, workers, seed, monitor
+        )
+    else:
+        best_grid, best_score, normal_pos, frozen_pos = place_tiles_optimally(
+            grid, k_normal, l_frozen, max_attempts,dbg, rng=random.Random(seed), monitor=monitor
+        )
+    stats.phases['search'] += perf_counter() - search_start
+    if start_tiles and (best_grid is None or start_score > best_score):
+        normal_pos, frozen_pos = _split_layout(start_tiles)
+        best_score = start_score
+        best_grid = LayoutScorer(grid).grid_with(normal_pos, frozen_pos)
     if best_grid is not None:
         if dbg:
             print(f"\nOptimal configuration found!")
@@ -486,7 +1615,7 @@ def find_optimal_tile_placement(grid, k_normal, l_frozen, max_attempts=10000,dbg
             print("\nOptimal grid:")
             _,best_path=min_distance(best_grid)
             visualize_grid(best_grid,best_path)
-        return {
+        result = {
             'original_score': original_score,
             'best_score': best_score,
             'improvement': best_score - original_score,
@@ -494,10 +1623,35 @@ def find_optimal_tile_placement(grid, k_normal, l_frozen, max_attempts=10000,dbg
             'normal_positions': normal_pos,
             'frozen_positions': frozen_pos
         }
+        if proven_optimal is not None:
+            result['proven_optimal'] = proven_optimal
+        if seeds:
+            result['seed_score'] = start_score
+        if monitor.deadline is not None:
+            result['timed_out'] = monitor.timed_out
+        return result
     else:
         print("No valid placement found!")
         return None
 
+python_min_distance = min_distance
+if os.environ.get('SOLVER_ENGINE') == 'bitboard':
+    # Bit-parallel BFS instead of the pure-Python one wherever the kernel is not used; 2x2
+    # fit tests and window scans stay on NumPy, which beats the bitset versions
+    from bitboard import min_distance as python_min_distance
+if os.environ.get('SOLVER_ENGINE') != 'python':
+    # Numba-compiled BFS when Numba is installed, python_min_distance otherwise
+    import bfs_kernel
+
+    def min_distance(grid):
+        return bfs_kernel.min_distance(grid) if bfs_kernel.available() else python_min_distance(grid)
+
+    def _kernel_search(grid):
+        return bfs_kernel.min_distance(grid) if bfs_kernel.available() else None
+
+    # One compiled BFS on the tiled board is cheaper than repairing the Python BFS tree
+    IncrementalPathEvaluator.board_search = staticmethod(_kernel_search)
+
 if __name__=='__main__':
     n=18
     m=16
@@ -0,0 +1,60 @@
+"""
+Debug visualization of solver grids. Imports matplotlib, so only import this module
+when plotting: utils.visualize_grid loads it on first use.
+"""
+import matplotlib.pyplot as plt
+from matplotlib.colors import ListedColormap, BoundaryNorm
+
+def visualize_grid(grid,path=None,highlight_cells=None):
+    """
+    Visualize the processed grid with custom colors for each value.
+    """
+    # Define a mapping from tile values to custom colors
+    color_dict = {
+        0: "#9ee3f5",  # light gray for Empty
+        1: "#f42121",  # red for Red Block
+        2: "#3B59EF",  # blue for Frost
+        3:"#65737E",
+        4:"#2F3068",
+        -1:"#3DF659", #start
+        -2:"#FFAD1F" #end
+        # Add more if needed
+    }
+
+    # Create a color list ordered by sorted keys of color_dict
+    value_list = sorted(color_dict.keys())
+    color_list = [color_dict[val] for val in value_list]
+
+    # Create colormap and norm
+    cmap = ListedColormap(color_list)
+    norm = BoundaryNorm(boundaries=[v - 0.5 for v in value_list] + [value_list[-1] + 0.5], ncolors=len(color_list))
+
+    plt.figure(figsize=(12, 8))
+    im = plt.imshow(grid, cmap=cmap, norm=norm, interpolation='nearest')
+    cbar = plt.colorbar(im, ticks=value_list)
+    cbar.ax.set_yticklabels([f'{val} ({label})' for val, label in zip(value_list, ['Empty', 'Normal Fixed', 'Frost fixed','Normal Movable','Frost Movable','Start','End'])])
+
+    plt.title('Processed Game Grid')
+    plt.xlabel('Column')
+    plt.ylabel('Row')
+
+    # Add grid lines
+    for i in range(grid.shape[1] + 1):
+        plt.axvline(i - 0.5, color='white', linewidth=0.5, alpha=0.85)
+    for i in range(grid.shape[0] + 1):
+        plt.axhline(i - 0.5, color='white', linewidth=0.5, alpha=0.85)
+
+    # Plot path if provided
+    if path:
+        rows, cols = zip(*path)
+        plt.plot(cols, rows, color='black', linewidth=2, marker='o', markersize=4, label='Path')
+        plt.legend()
+    
+    # Plot red dots at highlighted cells
+    if highlight_cells:
+        highlight_rows, highlight_cols = zip(*highlight_cells)
+        plt.scatter(highlight_cols, highlight_rows, color='red', s=50, zorder=5, label='Highlighted Cells')
+
+
+    plt.tight_layout()
+    plt.show()
@@ -0,0 +1,104 @@
+"""
+Request ingest and compact response encodings.
+
+utils.extract_state checks a game-state payload with the helpers here while it builds
+the board, so malformed requests fail with InvalidState before any search starts.
+encode_result() turns a solver result into one of RESPONSE_FORMATS:
+
+    json    the plain result (default)
+    flat    positions as flat [row, col, row, col, ...] int lists, no parameters_used
+    binary  BINARY_HEADER followed by the normal then frozen positions as int16 pairs
+"""
+import struct
+import numpy as np
+
+MAX_SIDE = 256
+RESPONSE_FORMATS = ("json", "flat", "binary")
+# magic, best_score, original_score, normal tile count, frozen tile count
+BINARY_HEADER = struct.Struct("<4sddHH")
+BINARY_MAGIC = b"MZS1"
+
+class InvalidState(ValueError):
+    """A game-state payload that does not match the expected schema."""
+
+def require_int(value, name, low, high=None):
+    """value if it is an int within [low, high], else InvalidState."""
+    if type(value) is not int or value < low or (high is not None and value > high):
+        bound = f"in [{low}, {high}]" if high is not None else f">= {low}"
+        raise InvalidState(f"{name} must be an integer {bound}, got {value!r}")
+    return value
+
+def validate_header(raw):
+    """
+    Check the scalar part of a game-state payload.
+
+    Returns:
+        tuple: (board dict, height, width, tower count, clap count)
+    """
+    if not isinstance(raw, dict) or not isinstance(raw.get('board'), dict):
+        raise InvalidState("payload must be an object with a board")
+    board = raw['board']
+    height = require_int(board.get('height'), 'board.height', 2, MAX_SIDE)
+    width = require_int(board.get('width'), 'board.width', 2, MAX_SIDE)
+    towers = require_int(raw.get('towers'), 'towers', 0)
+    claps = require_int(raw.get('claps'), 'claps', 0, towers)
+    for name in ('staticTowers', 'startArea', 'endArea'):
+        if not isinstance(board.get(name), list):
+            raise InvalidState(f"board.{name} must be a list")
+    return board, height, width, towers, claps
+
+def validate_settings(raw):
+    """A payload's solver_settings ({} when absent); the payload and the settings must be objects."""
+    if not isinstance(raw, dict):
+        raise InvalidState("payload must be an object")
+    settings = raw.get('solver_settings')
+    if settings is None:
+        return {}
+    if not isinstance(settings, dict):
+        raise InvalidState("solver_settings must be an object")
+    return settings
+
+def validate_area(area, name, height, width):
+    """An area's cells as (x, y) tuples; they must lie on the one-cell frame around the board."""
+    try:
+        cells = [(c['x'], c['y']) for c in area]
+    except (KeyError, TypeError):
+        raise InvalidState(f"board.{name} has a cell without x and y") from None
+    if not cells:
+        raise InvalidState(f"board.{name} is empty")
+    for x, y in cells:
+        if type(x) is not int or type(y) is not int or not (-1 <= x <= width and -1 <= y <= height) \
+                or not (x in (-1, width) or y in (-1, height)):
+            raise InvalidState(f"board.{name} cell {(x, y)} is not on the frame around the board")
+    return cells
+
+def flatten(positions):
+    """[(r, c), ...] as a flat [r, c, ...] list of ints."""
+    return np.asarray(positions, dtype=np.int64).reshape(-1).tolist()
+
+def encode_result(result, response_format="json"):
+    """
+    A solver result in the requested format: a dict for json and flat, bytes for binary.
+    """
+    if response_format == "binary":
+        normal = np.asarray(result['normal_positions'], dtype=np.int16).reshape(-1)
+        frozen = np.asarray(result['frozen_positions'], dtype=np.int16).reshape(-1)
+        header = BINARY_HEADER.pack(BINARY_MAGIC, result['best_score'], result['original_score'],
+                                    len(normal) // 2, len(frozen) // 2)
+        return header + normal.tobytes() + frozen.tobytes()
+    if response_format == "flat":
+        result = {k: v for k, v in result.items() if k != 'parameters_used'}
+        for key in ('normal_positions', 'frozen_positions'):
+            if key in result:
+                result[key] = flatten(result[key])
+    return result
+
+def decode_binary(data):
+    """Inverse of the binary encoding: {best_score, original_score, normal_positions, frozen_positions}."""
+    magic, best, original, n_normal, n_frozen = BINARY_HEADER.unpack_from(data)
+    if magic != BINARY_MAGIC:
+        raise ValueError("not a binary solver result")
+    cells = np.frombuffer(data, dtype=np.int16, offset=BINARY_HEADER.size).reshape(-1, 2).tolist()
+    return {"best_score": best, "original_score": original,
+            "normal_positions": [tuple(p) for p in cells[:n_normal]],
+            "frozen_positions": [tuple(p) for p in cells[n_normal:n_normal + n_frozen]]}